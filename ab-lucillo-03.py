@@ -3,8 +3,35 @@
 
 
 from enum import Enum
+import argparse
+import array
+import copy
+import csv
+import glob
+import hashlib
+import io
+import itertools
+import json
+import marshal
+import math
+import mmap
+import multiprocessing
 import pathlib
+import pickle
+import platform
 import os
+import random
+import re
+import socketserver
+import sys
+import time
+import tracemalloc
+
+# NumPy is optional; without it the VectorEngine keeps its columns in lists of Python ints
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 # These are the mapping of Token Types and their corresponding Lexem names for Lexem table
@@ -21,6 +48,20 @@ types = [11, 12, 16, 17,
          28, 29, 30, 31,
          32, 33, 34, 35]
 
+# Bytes that are not allowed in the source code; only printable ASCII, tab and new line are accepted
+invalid_char_pattern = re.compile(rb'[^\t\n\x20-\x7e]')
+
+# Bytes that are not ASCII; the source code must be valid UTF-8 if it has any of them
+non_ascii_pattern = re.compile(rb'[\x80-\xff]')
+
+# Characters that can be part of a text accepted by int or float, such as "1_000", " 1e5" or "-inf"; a text with
+#   any other ASCII character is not a number
+number_chars = frozenset("0123456789+-._eEinftyaINFTYA \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")
+
+# Lexemes recognized by the lexer in a single pass; whitespace and comments are matched only to be skipped
+token_pattern = re.compile(rb'(?P<eos>\n)|(?P<space>[ \t]+)|(?P<comment>#[^\n]*)|'
+                           rb'(?P<string>"[^"\n]*"?)|(?P<word>[^ \t\n]+)')
+
 
 # Token Type enumeration for use in operations
 class TokenType(Enum):
@@ -60,6 +101,8 @@ class TokenType(Enum):
 
 # Token class that holds token information
 class Token:
+    __slots__ = ("type", "value", "line_no")
+
     def __init__(self, _type, _value, _line_no):
         self.type = _type
         self.value = _value
@@ -68,10 +111,7 @@ class Token:
     # Returns the TokenType instance if it matches any of the defined keywords
     @staticmethod
     def get_token_type(_type):
-        for i, typ in enumerate(keywords):
-            if typ == _type:
-                return TokenType(types[i])
-        return None
+        return keyword_token_types.get(_type)
 
     # Checks if the Token is an arithmetic operator
     def is_arithmetic_operator(self):
@@ -85,19 +125,41 @@ class Token:
     def get_line_no(self): return self.line_no
 
 
-# Variable class to hold programmer-defined identifier information
-class Variable:
-    def __init__(self, _name, _type, _value):
-        self.name = _name
-        self.type = _type
-        self.value = _value
+# Lookup of the Token Type of each keyword
+keyword_token_types = {keyword: TokenType(typ) for keyword, typ in zip(keywords, types)}
 
 
 # Value class to hold the values returned by expressions
+# Values are never modified once created, so the same Value can be returned by any number of expressions
+# The value is displayed as it is, such as the lexeme "007" of a number literal, while a NUMBER value also holds
+#   its int value, which is converted once when the value is created
 class Value:
-    def __init__(self, _type, _value):
+    __slots__ = ("type", "value", "number")
+
+    def __init__(self, _type, _value, _number=None):
         self.type = _type
         self.value = _value
+        self.number = _number
+
+
+# Variable class to hold programmer-defined identifier information
+# A variable is also the Value of the expressions that read it, so reading a variable creates no new Value
+class Variable(Value):
+    __slots__ = ("name",)
+
+    def __init__(self, _name, _type, _value, _number=None):
+        super().__init__(_type, _value, _number)
+        self.name = _name
+
+
+# Returns the Value of an integer; the Values of small integers are shared instead of created each time
+def get_number_value(number):
+    if -5 <= number <= 256:
+        return small_number_values[number + 5]
+    return Value(TokenType.NUMBER, number, number)
+
+
+small_number_values = [Value(TokenType.NUMBER, number, number) for number in range(-5, 257)]
 
 
 # InterpreterError exception class for INTERPOL-specific errors
@@ -115,147 +177,169 @@ class InterpreterError(Exception):
     FILE_EMPTY = "File is empty"
     FILE_NOT_FOUND = "File not found"
     INVALID_FILE = "Invalid file"
+    LIMIT_EXCEEDED = "Execution limit exceeded"
 
     def __init__(self, _message, line_no, line):
+        self.kind = _message
         self.message = _message + " at line number [ " + str(line_no) + " ]" + "\n" + \
             " ----> " + line
         super().__init__(self.message)
 
 
+# Returns the source code as bytes; a source code that is already bytes or a mmap is returned as it is
+def get_source_bytes(code):
+    if isinstance(code, str):
+        return code.encode("utf-8")
+    return code
+
+
+# Returns the number of bytes of the UTF-8 character that starts with the given byte
+def get_char_length(first_byte):
+    if first_byte >= 0xf0:
+        return 4
+    if first_byte >= 0xe0:
+        return 3
+    if first_byte >= 0xc0:
+        return 2
+    return 1
+
+
 # Lexer class to tokenize the program source code
+# The source is scanned in a single pass with token_pattern; the lexer only keeps offsets into the source and
+#   rebuilds the text of the current line when it is needed for an error message
+# The source is scanned as bytes, so a mmap of the source file can be lexed without reading it into memory;
+#   only the lexemes of the tokens are decoded to text
 class Lexer:
     def __init__(self, _code):
-        self.code = _code
-        self.index = -1
-        self.char = None
+        self.code = get_source_bytes(_code)
+        self.index = -1                     # Offset of the last character read
         self.line_no = 1
-        self.line = ""
+        self.line_start = 0                 # Offset where the current line starts
+        self.token_start = 0                # Offset where the last token read starts
 
-    # Move to the next character
-    def next_char(self):
-        if (self.index + 1) < len(self.code):
-            self.index += 1
-            self.char = self.code[self.index]
+        # Lexing stops at the first character that is not printable ASCII, tab or new line
+        invalid_char = invalid_char_pattern.search(self.code)
+        self.invalid_index = invalid_char.start() if invalid_char is not None else len(self.code)
 
-            self.line += self.char
+    # Returns the current line read so far, excluding the new line characters
+    @property
+    def line(self):
+        return self.get_line(self.line_span())
 
-            # Check if the character is an acceptable ASCII code
-            if not self.is_printable_ascii_char(self.char):
-                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
-        else:
-            self.char = None
+    # Returns the start and end offsets of the current line read so far
+    def line_span(self): return self.line_start, self.index + 1
 
-        return self.char
+    # Returns the text between the offsets of a line span, excluding the new line characters
+    def get_line(self, span): return self.code[span[0]:span[1]].replace(b"\n", b"").decode("utf-8", "replace")
+
+    # Clears the current line; the next line starts after the last character read
+    def clear_line(self): self.line_start = self.index + 1
 
     # Get the next token
     def next_token(self):
-        token = None
+        while self.index + 1 < self.invalid_index:
+            match = token_pattern.match(self.code, self.index + 1, self.invalid_index)
+            kind = match.lastgroup
+            start = self.token_start = self.index + 1
+            self.index = match.end() - 1
 
-        while self.next_char() is not None:
-            # Skip whitespace
-            if self.char in ['\r', ' ', '\t']:
-                pass
+            # End of statement reached
+            if kind == "eos":
+                token = Token(TokenType.END_OF_STATEMENT, "EOS", self.line_no)
+                self.line_no += 1
+                return token
 
-            # If first char is alphabetic, it can be a keyword
-            elif self.char.isalpha():
-                text = self.advance_chars()
-                token_type = Token.get_token_type(text)
+            # Skip whitespace and comments
+            if kind == "space" or kind == "comment":
+                continue
 
-                # Token is a keyword of the program
-                if token_type is not None:
-                    token = Token(token_type, text, self.line_no)
-                # Token is an invalid identifier
-                elif text[0].isalpha() and len(text) < 50 and self.is_printable_ascii_string(text):
-                    token = Token(TokenType.IDENTIFIER, text, self.line_no)
-                # Token is not a keyword nor an identifier
-                else:
-                    raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
+            text = match.group().decode("ascii")
 
             # If the first char is double quotes, it can be a string
-            elif self.char == '"':
-                text = self.advance_chars('"')
-
+            if kind == "string":
                 # If the token is not properly enclosed by an ending double quotes
-                if not (len(text) > 1 and text[0] == '"' and text[len(text) - 1] == '"'):
+                if not (len(text) > 1 and text[-1] == '"'):
+                    self.check_invalid_char()
                     raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
                 # Retrieve the string literal excluding the double quotes
-                text = text[1:len(text)-1]
+                return Token(TokenType.STRING, text[1:-1], self.line_no)
 
-                token = Token(TokenType.STRING, text, self.line_no)
+            first_char = text[0]
 
-            # If first char is numeric or has negative or decimal point sign, it can be a number
-            elif self.char.isdigit() or self.char == "-" or self.char == ".":
-
-                text = self.advance_chars()
-                typ = self.get_type(text)
-                # It is a floating-point value
-                if typ == 1:
-                    raise InterpreterError(InterpreterError.INVALID_DATA_TYPE, self.line_no, self.line)
-                # It is a string value
-                elif typ == 2:
-                    raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
+            # If an unrecognized token is detected
+            if not (first_char.isalpha() or first_char.isdigit() or first_char == "-" or first_char == "."):
+                self.index = start
+                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
 
-                token = Token(TokenType.NUMBER, text, self.line_no)
+            self.check_invalid_char()
+
+            # If first char is alphabetic, it can be a keyword
+            if first_char.isalpha():
+                token_type = Token.get_token_type(text)
 
-            # If starts with #, it is a comment
-            elif self.char == "#":
-                # Advance chars until newline or end of statement is reached
-                self.advance_chars('\n')
+                # Token is a keyword of the program
+                if token_type is not None:
+                    return Token(token_type, text, self.line_no)
+                # Token is a valid identifier
+                if len(text) < 50:
+                    return Token(TokenType.IDENTIFIER, text, self.line_no)
+                # Token is not a keyword nor an identifier
+                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
 
-            # End of statement reached
-            elif self.char == "\n":
-                token = Token(TokenType.END_OF_STATEMENT, "EOS", self.line_no)
-                self.line_no += 1
-                # Remove the newline character
-                self.line = self.line[0:len(self.line)-1]
-            # If an unrecognized token is detected
-            else:
+            # If first char is numeric or has negative or decimal point sign, it can be a number
+            typ = self.get_type(text)
+            # It is a floating-point value
+            if typ == 1:
+                raise InterpreterError(InterpreterError.INVALID_DATA_TYPE, self.line_no, self.line)
+            # It is a string value
+            elif typ == 2:
                 raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
 
-            # Returns token when it is already created; terminates the while statement
-            if token is not None:
-                return token
+            return Token(TokenType.NUMBER, text, self.line_no)
+
+        # If an invalid character is reached, it is included in the line of the error message
+        self.check_invalid_char()
+        self.token_start = self.index + 1
+
         # Increments the current line number; if this is reached, it means there are no tokens detected
         self.line_no += 1
-        token = Token(TokenType.END_OF_FILE, "EOF", self.line_no)
 
-        return token
+        return Token(TokenType.END_OF_FILE, "EOF", self.line_no)
+
+    # Throws an error if the lexeme just read stopped at an invalid character
+    def check_invalid_char(self):
+        if self.index + 1 == self.invalid_index < len(self.code):
+            # The whole UTF-8 character is included in the line of the error message
+            self.index += get_char_length(self.code[self.invalid_index])
+            raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.line_no, self.line)
 
     @staticmethod
     # Returns the the type of the literal value
     # 0 is integer; 1 is float; 2 is non-numeric
     def get_type(text):
-        typ = 0
+        return Lexer.get_number(text)[0]
+
+    # Returns the type of the literal value and its int value, which is None if it is not an integer
+    # ASCII digits and words are classified by their characters, so that no error of int and float is caught
+    @staticmethod
+    def get_number(text):
+        if text.isascii():
+            if text.isdigit():
+                return 0, int(text)
+            if not number_chars.issuperset(text):
+                return 2, None
+
         try:
-            int(text)
+            return 0, int(text)
         except ValueError:
-            typ = 1
-            try:
-                float(text)
-            except ValueError:
-                typ = 2
-
-        return typ
-
-    # Returns characters before any whitespace
-    def advance_chars(self, delimiter=None):
-        start_pos = self.index
-
-        # Continue to iterate characters until there are no more characters to read,
-        #   character is a whitespace except when there's a delimiter (e.g. searching for strings enclosed in ""),
-        #   character is not a delimiter and character is not end of line (\n)
-        while self.next_char() is not None and \
-                ((not self.char.isspace() and delimiter is None) or
-                 (delimiter is not None))\
-                and not self.char == delimiter and not self.char == '\n':
             pass
 
-        # If loop above terminates due to space, move back cursor to last non-space char
-        if self.char is not None and self.char.isspace():
-            self.index -= 1
-            self.line = self.line[0:len(self.line)-1]
+        try:
+            float(text)
+        except ValueError:
+            return 2, None
 
-        return self.code[start_pos: self.index + 1]
+        return 1, None
 
     # Returns true if char is in printable ASCII chart including tab and new line
     @staticmethod
@@ -265,242 +349,444 @@ class Lexer:
         else:
             return 32 <= ord(c) <= 126
 
+    # Returns true if all the chars are in printable ASCII chart excluding tab and new line; checked in bulk
     @staticmethod
     def is_printable_ascii_string(string):
-        for c in string:
-            if not Lexer.is_printable_ascii_char(c, False):
-                return False
-        return True
+        return string.isascii() and string.isprintable()
 
 
-# Parser class that uses the tokens from the parser, checks the syntax and semantics of the tokens,
-#  and executes the program
-class Parser:
-    def __init__(self, _lexer):
-        self.lexer = _lexer
-        self.token = None
-        self.tokens = []
-        self.variables = {}
-        self.has_begin = False              # Flags that there is already a BEGIN statement
-        self.has_end = False                # Flags that there is already an END statement
-        self.prev_print_has_newline = True  # Flags that previous PRINT statement has a newline affixed to it
-        self.prev_non_eos_line = None       # Contains the previous executable statement; used for Invalid end of file
-        self.prev_non_eos_lineno = None     # Contains the previous line number of an executable statement
-        self.longest_variable_length = 0    # Contains the longest variable name length for symbols table
-        self.store_op_in_use = False        # Flags that STORE operation is in use
-        self.arith_op_in_use = False        # Flags that any of the arithmetic operations is in use
+# TokenTable class that keeps the tokens read by the parser for the LEXEMES/TOKENS table
+# The tokens are kept in compact array columns instead of Token instances: the type, the line number and the
+#   offset of the lexeme in the source code, which is scanned again only when the table is displayed
+class TokenTable:
+    displayed = True                    # Flags that the table is displayed at the end of the execution
 
-    # Main parser logic that checks each token and calls its corresponding method for further evaluation
-    def execute(self):
-        self.next_token()
+    def __init__(self, _code):
+        self.code = _code
+        self.types = array.array("B")
+        self.line_nos = array.array("I")
+        self.offsets = array.array("Q")
 
-        try:
-            while True:
-                # Make sure the first executable statement is BEGIN
-                if not self.has_begin and self.token.type is not TokenType.END_OF_STATEMENT \
-                        and self.token.type is not TokenType.PROGRAM_BEGIN or \
-                        (self.has_end and self.token.type is TokenType.PROGRAM_END):
-                    raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
-
-                if self.token.type is TokenType.PROGRAM_BEGIN:
-                    self.has_begin = True
-
-                elif self.token.type is TokenType.OUTPUT or self.token.type is TokenType.OUTPUT_WITH_LINE:
-                    if self.token.type is TokenType.OUTPUT:
-                        self.print("")
-                        self.prev_print_has_newline = False
-                    else:
-                        self.print("\n")
-                        self.prev_print_has_newline = True
-
-                elif self.token.type is TokenType.DECLARATION_INT or self.token.type is TokenType.DECLARATION_STRING:
-                    self.assign()
-
-                elif self.token.type is TokenType.ASSIGN_KEY:
-                    self.store()
-
-                elif self.token.type is TokenType.INPUT:
-                    self.input()
-
-                elif self.token.type is TokenType.PROGRAM_END:
-                    self.has_end = True
-
-                elif self.token.is_arithmetic_operator():
-                    self.evaluate_expression()
-
-                # Clears the current line if end of statement is reached (i.e. it is time for the next statement)
-                if self.token.type is TokenType.END_OF_STATEMENT:
-                    self.clear_current_line()
-                # Resets the flag
-                self.arith_op_in_use = False
-
-                prev_token = self.token
-                self.next_token()
-
-                # Skip to evaluation of token above if this is a completely new statement
-                if prev_token.type is TokenType.END_OF_STATEMENT and self.token.type is not TokenType.END_OF_FILE:
-                    continue
-                # If end of file is reached, check if END was encountered, then terminate the loop
-                if self.token.type is TokenType.END_OF_FILE:
-                    if not self.has_end:
-                        raise InterpreterError(InterpreterError.INVALID_EOF, self.prev_non_eos_lineno,
-                                               self.prev_non_eos_line)
-                    break
-                # Expects that each method above should end with EOS
-                if self.token.type is not TokenType.END_OF_STATEMENT:
-                    raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+    # Adds a token that starts at the given offset of the source code
+    def append(self, token, offset):
+        self.types.append(token.type.value)
+        self.line_nos.append(token.line_no)
+        self.offsets.append(offset)
 
-        except InterpreterError as e:
-            # Display the error message and prefix a newline if previous print has no newline
-            print(('\n' if not self.prev_print_has_newline else '') + str(e), end="")
+    # Adds all the tokens of another table
+    def extend(self, table):
+        self.types.extend(table.types)
+        self.line_nos.extend(table.line_nos)
+        self.offsets.extend(table.offsets)
 
-    # Evaluates the expression to reach its value through recursion algorithm
-    # This is where literal values, variables, and arithmetic operators are evaluated
-    def evaluate_expression(self):
-        value = None
+    def __len__(self): return len(self.types)
 
-        if self.token.type is TokenType.IDENTIFIER:
-            variable = self.get_variable(self.token.value)
+    # Returns the line number, token type and lexeme of the first count tokens
+    def rows(self, count):
+        for index in range(count):
+            token_type = TokenType(self.types[index])
+            yield self.line_nos[index], token_type, self.get_lexeme(token_type, self.offsets[index])
+
+    # Returns the lexeme of the token of the given type that starts at the given offset
+    def get_lexeme(self, token_type, offset):
+        if token_type is TokenType.END_OF_STATEMENT:
+            return "EOS"
+        if token_type is TokenType.END_OF_FILE:
+            return "EOF"
+
+        text = token_pattern.match(self.code, offset).group().decode("ascii")
+
+        # Retrieve the string literal excluding the double quotes
+        if token_type is TokenType.STRING:
+            return text[1:-1]
+        return text
+
+
+# TokenCounter class that only counts the tokens read by the parser; the table is not kept at all
+class TokenCounter:
+    displayed = False
+
+    def __init__(self):
+        self.count = 0
+
+    def append(self, token, offset): self.count += 1
+
+    def extend(self, table): self.count += len(table)
+
+    def __len__(self): return self.count
+
+
+# TokenStream class that writes the table rows to a file while the tokens are read, instead of keeping them
+# All the tokens read are written, even those after the error that stopped the execution
+class TokenStream(TokenCounter):
+    def __init__(self, _sink):
+        super().__init__()
+        self.sink = _sink
+
+    def append(self, token, offset):
+        super().append(token, offset)
+        self.sink.write(get_token_row(token.line_no, token.type, token.value) + "\n")
+
+    def extend(self, table):
+        super().extend(table)
+
+        for row in table.rows(len(table)):
+            self.sink.write(get_token_row(*row) + "\n")
+
+
+# Returns the row of the LEXEMES/TOKENS table of a token
+def get_token_row(line_no, token_type, lexeme):
+    return str(line_no).ljust(10) + token_type.name.ljust(32) + lexeme
+
+
+# Node classes of the abstract syntax tree produced by the Parser
+# Each node keeps the site where it ends, which is the state of the lexer after reading its last token:
+#   (line number, line start offset, line end offset, number of tokens read)
+# The sites are used by the Interpreter to report runtime errors exactly as when the program is parsed while
+#   being executed
+
+# Literal value (NUMBER or STRING)
+class Literal:
+    def __init__(self, _value, _site):
+        self.value = _value
+        self.site = _site
+
+
+# Variable read; checked flags that the variable is used within an arithmetic operation
+class Identifier:
+    def __init__(self, _name, _checked, _site):
+        self.name = _name
+        self.checked = _checked
+        self.site = _site
+
+
+# Arithmetic operation; the last operand is a Fail node if the operation is incomplete
+class Arithmetic:
+    def __init__(self, _operator, _operands, _site):
+        self.operator = _operator
+        self.operands = _operands
+        self.site = _site
+        self.key = None                     # Contains the key shared by the identical operations of the program
+        self.names = ()                     # Contains the names of the variables read by the operation
+
+
+# Error found while parsing; it is raised once the execution reaches it
+class Fail:
+    def __init__(self, _message, _site):
+        self.message = _message
+        self.site = _site
+
+
+# PRINT and PRINTLN statements
+class Output:
+    def __init__(self, _expression, _end):
+        self.expression = _expression
+        self.end = _end
+
+
+# VARINT and VARSTR statements; expression is None if there is no WITH operator
+class Declaration:
+    def __init__(self, _name, _type, _expression, _site):
+        self.name = _name
+        self.type = _type
+        self.expression = _expression
+        self.site = _site
+
+
+# STORE statement
+class Assignment:
+    def __init__(self, _expression, _name, _site):
+        self.expression = _expression
+        self.name = _name
+        self.site = _site
+
+
+# INPUT statement; assign_site is None if the statement is incomplete, then the value is read but not assigned
+class Input:
+    def __init__(self, _name, _site, _assign_site):
+        self.name = _name
+        self.site = _site
+        self.assign_site = _assign_site
+
+
+# Expression evaluated as a statement, or the evaluated part of an incomplete statement
+class Evaluation:
+    def __init__(self, _expression):
+        self.expression = _expression
+
+
+# Program class that holds the parsed statements; it can be executed any number of times
+class Program:
+    def __init__(self, _code, _statements):
+        self.code = _code
+        self.statements = _statements
+
+    # Returns the line of a site, excluding the new line characters
+    def get_line(self, site): return self.code[site[1]:site[2]].replace(b"\n", b"").decode("utf-8", "replace")
 
-            if variable is None:
-                raise InterpreterError(InterpreterError.VARIABLE_NOT_DECLARED, self.token.line_no,
-                                       self.get_current_line())
 
-            if self.arith_op_in_use is True:
-                self.check_compatibility(TokenType.NUMBER, Value(variable.type, variable.value))
+# Returns the value of a generator that stands for a recursive function, run without recursion
+# The generator yields the generator of each nested call instead of calling it, and receives its value; the
+#   generators are kept in a list, so nested calls of any depth use a constant depth of the Python stack
+def run_nested(generator):
+    generators = [generator]
+    value = None
+
+    while True:
+        try:
+            nested = generators[-1].send(value)
+        except StopIteration as stop:
+            generators.pop()
+
+            if not generators:
+                return stop.value
+            value = stop.value
+        else:
+            generators.append(nested)
+            value = None
+
+
+# Parser class that uses the tokens from the lexer, checks the syntax of the tokens,
+#  and produces the Program to be executed by the Interpreter
+# Parsing stops at the first error, which is added to the statements as a Fail node
+class Parser:
+    def __init__(self, _lexer, _tokens=None):
+        self.lexer = _lexer
+        self.token = None
+        self.tokens = _tokens if _tokens is not None else TokenTable(_lexer.code)
+        self.statements = []
+        self.failure = None                 # Contains the Fail node of the error that stopped the parsing
+        self.has_begin = False              # Flags that there is already a BEGIN statement
+        self.has_end = False                # Flags that there is already an END statement
+        self.prev_non_eos_site = None       # Contains the site of the previous executable statement; used for
+                                            #   Invalid end of file
+        self.store_op_in_use = False        # Flags that STORE operation is in use
+        self.arith_op_in_use = False        # Flags that any of the arithmetic operations is in use
 
-            value = Value(variable.type, variable.value)
+    # Main parser logic that checks each token and calls its corresponding method for further parsing
+    def parse(self):
+        if self.next_token() is None:
+            return self.get_program()
+
+        while True:
+            # Make sure the first executable statement is BEGIN
+            if not self.has_begin and self.token.type is not TokenType.END_OF_STATEMENT \
+                    and self.token.type is not TokenType.PROGRAM_BEGIN or \
+                    (self.has_end and self.token.type is TokenType.PROGRAM_END):
+                self.fail(InterpreterError.INVALID_SYNTAX)
+                break
+
+            self.parse_statement()
+
+            if self.failure is not None:
+                break
 
-        if self.token.type is TokenType.NUMBER:
-            value = Value(TokenType.NUMBER, self.token.value)
+            # Clears the current line if end of statement is reached (i.e. it is time for the next statement)
+            if self.token.type is TokenType.END_OF_STATEMENT:
+                self.clear_current_line()
+            # Resets the flag
+            self.arith_op_in_use = False
+
+            prev_token = self.token
+            if self.next_token() is None:
+                break
+
+            # Skip to evaluation of token above if this is a completely new statement
+            if prev_token.type is TokenType.END_OF_STATEMENT and self.token.type is not TokenType.END_OF_FILE:
+                continue
+            # If end of file is reached, check if END was encountered, then terminate the loop
+            if self.token.type is TokenType.END_OF_FILE:
+                if not self.has_end:
+                    self.failure = Fail(InterpreterError.INVALID_EOF, self.prev_non_eos_site[:3] +
+                                        (len(self.tokens),))
+                break
+            # Expects that each method above should end with EOS
+            if self.token.type is not TokenType.END_OF_STATEMENT:
+                self.fail(InterpreterError.INVALID_SYNTAX)
+                break
+
+        return self.get_program()
+
+    # Parses the statement of the first line of the source code on its own, without the checks of BEGIN and END that
+    #   depend on the other statements
+    # Returns the site of the first token of the line, or None if the line has no tokens
+    def parse_line(self):
+        self.has_begin = True
+
+        if self.next_token() is None or self.token.type is TokenType.END_OF_STATEMENT:
+            return None
+
+        site = self.get_site()
+
+        # The end of file is the first token of a source code with only comments and no new line, which is an error
+        #   since it is not BEGIN; an empty line has no tokens
+        if self.token.type is TokenType.END_OF_FILE:
+            return site if self.lexer.code else None
+
+        self.parse_statement()
+
+        # Expects that the statement should end with EOS
+        if self.failure is None and self.token.type is not TokenType.END_OF_STATEMENT and \
+                self.next_token() is not None and self.token.type is not TokenType.END_OF_STATEMENT and \
+                self.token.type is not TokenType.END_OF_FILE:
+            self.fail(InterpreterError.INVALID_SYNTAX)
+
+        return site
+
+    # Checks the statement of the current token and calls its corresponding method for further parsing
+    def parse_statement(self):
+        if self.token.type is TokenType.PROGRAM_BEGIN:
+            self.has_begin = True
+
+        elif self.token.type is TokenType.OUTPUT:
+            self.print("")
+
+        elif self.token.type is TokenType.OUTPUT_WITH_LINE:
+            self.print("\n")
+
+        elif self.token.type is TokenType.DECLARATION_INT or self.token.type is TokenType.DECLARATION_STRING:
+            self.assign()
+
+        elif self.token.type is TokenType.ASSIGN_KEY:
+            self.store()
+
+        elif self.token.type is TokenType.INPUT:
+            self.input()
+
+        elif self.token.type is TokenType.PROGRAM_END:
+            self.has_end = True
+
+        elif self.token.is_arithmetic_operator():
+            self.statements.append(Evaluation(self.parse_expression()))
+
+    # Parses the expression
+    # This is where literal values, variables, and arithmetic operators are parsed
+    # Nested operations are parsed by run_nested, so expressions of any depth are parsed without recursion
+    def parse_expression(self):
+        if self.token.is_arithmetic_operator():
+            return run_nested(self.parse_operation())
+        return self.parse_value()
+
+    # Parses a literal value or a variable; any other token is an expression error
+    def parse_value(self):
+        token = self.token
+
+        if token.type is TokenType.IDENTIFIER:
+            return Identifier(token.value, self.arith_op_in_use, self.get_site())
 
-        if self.token.type is TokenType.STRING:
-            value = Value(TokenType.STRING, self.token. value)
+        if token.type is TokenType.NUMBER:
+            return Literal(Value(token.type, token.value, int(token.value)), self.get_site())
+        if token.type is TokenType.STRING:
+            return Literal(Value(token.type, token.value), self.get_site())
+
+        return self.fail(InterpreterError.INVALID_EXPRESSION)
+
+    # Parses the arithmetic operation of the current token; a generator run by run_nested, which yields the
+    #   generator of each nested operation and receives the parsed operation
+    def parse_operation(self):
+        token = self.token
+        operands = []
 
-        if self.token.has_two_operators():
+        if token.has_two_operators():
             self.arith_op_in_use = True
-            return self.two_operators_arithmetic()
+
+            for _ in range(2):
+                if not (yield from self.parse_operand(operands)):
+                    break
 
         # Checks the syntax for: MEAN <expr1> <expr2> <expr3> … <exprn>
-        elif self.token.type is TokenType.ADVANCED_OPERATOR_AVE:
+        elif token.type is TokenType.ADVANCED_OPERATOR_AVE:
             self.arith_op_in_use = True
-            count = 0
-            sum_of_value = 0
 
-            self.next_token()
+            if self.next_token() is None:
+                operands.append(self.failure)
 
-            while self.token.type is not TokenType.END_OF_STATEMENT:
+            while self.failure is None and self.token.type is not TokenType.END_OF_STATEMENT:
                 if (self.token.type is TokenType.ASSIGN_VAR_KEY and self.store_op_in_use) or \
                         self.token.type is TokenType.DISTANCE_SEPARATOR:
                     break
 
-                value = self.evaluate_expression()
-                self.check_compatibility(TokenType.NUMBER, value)
-
-                sum_of_value += int(str(value.value))
-                count += 1
-                self.next_token()
+                if self.token.is_arithmetic_operator():
+                    operands.append((yield self.parse_operation()))
+                else:
+                    operands.append(self.parse_value())
 
-            try:
-                result = Value(TokenType.NUMBER, int(sum_of_value/count))
-            except ArithmeticError:
-                raise InterpreterError(InterpreterError.INVALID_ARITHMETIC_OPERATION, self.token.line_no,
-                                       self.get_current_line())
+                if self.failure is None and self.next_token() is None:
+                    operands.append(self.failure)
 
-            return result
         # Checks the syntax for: DIST <expr1> <expr2> AND <expr3> <expr4>
-        elif self.token.type is TokenType.ADVANCED_OPERATOR_DIST:
+        else:
             self.arith_op_in_use = True
 
-            self.next_token()
-            expr1 = self.evaluate_expression()
-            self.check_compatibility(TokenType.NUMBER, expr1)
-            expr1 = int(expr1.value)
-
-            self.next_token()
-            expr2 = self.evaluate_expression()
-            self.check_compatibility(TokenType.NUMBER, expr2)
-            expr2 = int(expr2.value)
+            if (yield from self.parse_operand(operands)) and (yield from self.parse_operand(operands)):
+                operator = self.token if self.token.type is TokenType.DISTANCE_SEPARATOR else self.next_token()
 
-            operator = self.token if self.token.type is TokenType.DISTANCE_SEPARATOR else self.next_token()
+                if operator is None:
+                    operands.append(self.failure)
+                elif operator.type is not TokenType.DISTANCE_SEPARATOR:
+                    operands.append(self.fail(InterpreterError.INVALID_SYNTAX))
+                elif (yield from self.parse_operand(operands)):
+                    yield from self.parse_operand(operands)
 
-            if operator.type is not TokenType.DISTANCE_SEPARATOR:
-                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+        return Arithmetic(token.type, operands, self.get_site())
 
-            self.next_token()
-            expr3 = self.evaluate_expression()
-            self.check_compatibility(TokenType.NUMBER, expr3)
-            expr3 = int(expr3.value)
-
-            self.next_token()
-            expr4 = self.evaluate_expression()
-            self.check_compatibility(TokenType.NUMBER, expr4)
-            expr4 = int(expr4.value)
-
-            try:
-                result = Value(TokenType.NUMBER, int((((expr4-expr2)**2)+((expr3-expr1)**2))**(1/2)))
-            except ArithmeticError:
-                raise InterpreterError(InterpreterError.INVALID_ARITHMETIC_OPERATION, self.token.line_no,
-                                       self.get_current_line())
-            return result
-        # If the evaluation result is None (including the variable value), it is an expression error
-        if value is None or (value is not None and type(value) is Value and value.value is None):
-            raise InterpreterError(InterpreterError.INVALID_EXPRESSION, self.token.line_no, self.get_current_line())
+    # Parses the next expression and adds it to the operands; returns False if there is an error
+    def parse_operand(self, operands):
+        if self.next_token() is None:
+            operands.append(self.failure)
+        elif self.token.is_arithmetic_operator():
+            operands.append((yield self.parse_operation()))
+        else:
+            operands.append(self.parse_value())
 
-        return value
+        return self.failure is None
 
     # Method to be called for INPUT statement
     # Checks this syntax: INPUT <variable_name>
     def input(self):
         variable = self.next_token()
 
+        if variable is None:
+            return
         if variable.type is not TokenType.IDENTIFIER:
-            raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+            self.fail(InterpreterError.INVALID_SYNTAX)
+            return
 
-        input_value = input()
+        site = self.get_site()
 
-        typ = Lexer.get_type(input_value)
-        # A floating-point value
-        if typ == 1:
-            raise InterpreterError(InterpreterError.INVALID_DATA_TYPE_INPUT, self.token.line_no,
-                                   self.get_current_line())
-        # An integer
-        elif typ == 0:
-            input_type = TokenType.NUMBER
-        # A string
+        if self.check_eos():
+            self.statements.append(Input(variable.value, site, self.get_site()))
         else:
-            input_type = TokenType.STRING
-
-            if not Lexer.is_printable_ascii_string(input_value):
-                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
-
-        self.check_eos()
-
-        self.assign_value_variable(variable.value, Value(input_type, input_value))
+            self.statements.append(Input(variable.value, site, None))
 
     # Method to be called for STORE statement
     # Checks this syntax: STORE <expression> IN <variable>
     def store(self):
-        self.next_token()
-        self.store_op_in_use = True
-        expr = self.evaluate_expression()
+        if self.next_token() is None:
+            return
 
-        operator = self.token if self.token.type in (TokenType.ASSIGN_VAR_KEY, TokenType.END_OF_STATEMENT) \
-            else self.next_token()
+        self.store_op_in_use = True
+        expr = self.parse_expression()
 
-        # Not using IN operator
-        if operator.type is not TokenType.ASSIGN_VAR_KEY:
-            raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+        if self.failure is None:
+            operator = self.token if self.token.type in (TokenType.ASSIGN_VAR_KEY, TokenType.END_OF_STATEMENT) \
+                else self.next_token()
 
-        identifier = self.next_token()
+            # Not using IN operator
+            if operator is not None and operator.type is not TokenType.ASSIGN_VAR_KEY:
+                self.fail(InterpreterError.INVALID_SYNTAX)
 
-        # Not an identifier
-        if identifier.type is not TokenType.IDENTIFIER:
-            raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+        if self.failure is None:
+            identifier = self.next_token()
 
-        self.check_eos()
+            # Not an identifier
+            if identifier is not None and identifier.type is not TokenType.IDENTIFIER:
+                self.fail(InterpreterError.INVALID_SYNTAX)
 
-        self.assign_value_variable(identifier.value, expr)
+        if self.failure is None and self.check_eos():
+            self.statements.append(Assignment(expr, identifier.value, self.get_site()))
+        else:
+            self.statements.append(Evaluation(expr))
 
         self.store_op_in_use = False
 
@@ -513,234 +799,3550 @@ class Parser:
     def assign(self):
         declaration_type = self.token
         identifier = self.next_token()
-        value = None
+        expr = None
 
+        if identifier is None:
+            return
         # Not an identifier
         if identifier.type is not TokenType.IDENTIFIER:
-            raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+            self.fail(InterpreterError.INVALID_SYNTAX)
+            return
 
         operator = self.next_token()
 
-        # Evaluate the expression if there is WITH operator
-        if operator is not None:
-            if operator.type is TokenType.DECLARATION_ASSIGN_WITH_KEY:
-                self.next_token()
-                value = self.evaluate_expression()
-                # No value evaluated from the expression
-                if value is None:
-                    raise InterpreterError(InterpreterError.INVALID_EXPRESSION, self.token.line_no,
-                                           self.get_current_line())
-            elif operator.type is TokenType.END_OF_STATEMENT:
-                pass
-            else:
-                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+        if operator is None:
+            return
+        # Parse the expression if there is WITH operator
+        if operator.type is TokenType.DECLARATION_ASSIGN_WITH_KEY:
+            if self.next_token() is None:
+                return
+            expr = self.parse_expression()
+        elif operator.type is not TokenType.END_OF_STATEMENT:
+            self.fail(InterpreterError.INVALID_SYNTAX)
+            return
+
         # Use the corresponding literal value type depending on the Assignment operator used (VARINT/VARSTR)
         if declaration_type.type is TokenType.DECLARATION_INT:
             variable_type = TokenType.NUMBER
         else:
             variable_type = TokenType.STRING
 
-        self.check_eos()
-
-        self.declare_variable(identifier.value, variable_type, value)
+        if self.failure is None and self.check_eos():
+            self.statements.append(Declaration(identifier.value, variable_type, expr, self.get_site()))
+        else:
+            self.statements.append(Evaluation(expr))
 
     # Method to be called for PRINT and PRINTLN statements
     # Check these syntaxes: PRINT <expression> ; PRINTLN <expression>
     def print(self, _end):
-        self.next_token()
-        value = self.evaluate_expression()
-        # No value evaluated from the expression
-        if value is None:
-            raise InterpreterError(InterpreterError.INVALID_EXPRESSION, self.token.line_no, self.get_current_line())
+        if self.next_token() is None:
+            return
 
-        self.check_eos()
+        expr = self.parse_expression()
 
-        print(value.value, end=_end)
+        if self.failure is None and self.check_eos():
+            self.statements.append(Output(expr, _end))
+        else:
+            self.statements.append(Evaluation(expr))
 
-    # Handles arithmetic operations with only two parameters
-    # Checks these syntaxes:
-    #   ADD <expression1> <expression2>
-    #   SUB <expression1> <expression2>
-    #   MUL <expression1> <expression2>
-    #   DIV <expression1> <expression2>
-    #   MOD <expression1> <expression2>
-    #   RAISE <expression> <exponent>
-    #   ROOT <N> <expression>
-    def two_operators_arithmetic(self):
-        operator = self.token.type
+    # Returns False if there is an extra token at the end of a valid statement
+    def check_eos(self):
+        if self.token.type is not TokenType.END_OF_STATEMENT:
+            if self.next_token() is None:
+                return False
+            if self.token.type is not TokenType.END_OF_STATEMENT:
+                self.fail(InterpreterError.INVALID_SYNTAX)
+                return False
+        return True
+
+    # Stops the parsing due to an error at the current token; returns the Fail node of the error
+    def fail(self, message):
+        self.failure = Fail(message, self.get_site())
+        return self.failure
+
+    # Returns the site of the current token
+    def get_site(self): return (self.token.line_no,) + self.lexer.line_span() + (len(self.tokens),)
 
-        self.next_token()
-        operand1 = self.evaluate_expression()
-        self.check_compatibility(TokenType.NUMBER, operand1)
+    # Clears the current line
+    def clear_current_line(self): self.lexer.clear_line()
 
-        operand1 = int(operand1.value)
+    # Returns the parsed program; the error that stopped the parsing is its last statement
+    def get_program(self):
+        if self.failure is not None:
+            self.statements.append(self.failure)
 
-        self.next_token()
-        operand2 = self.evaluate_expression()
-        self.check_compatibility(TokenType.NUMBER, operand2)
-        operand2 = int(operand2.value)
+        return Program(self.lexer.code, self.statements)
 
+    # Returns the next token from the lexer; returns None if the lexer found an error
+    def next_token(self):
         try:
-            if operator == TokenType.BASIC_OPERATOR_ADD:
-                return Value(TokenType.NUMBER, operand1 + operand2)
-            if operator == TokenType.BASIC_OPERATOR_SUB:
-                return Value(TokenType.NUMBER, operand1 - operand2)
-            if operator == TokenType.BASIC_OPERATOR_MUL:
-                return Value(TokenType.NUMBER, operand1 * operand2)
-            if operator == TokenType.BASIC_OPERATOR_DIV:
-                return Value(TokenType.NUMBER, int(operand1 / operand2))
-            if operator == TokenType.BASIC_OPERATOR_MOD:
-                return Value(TokenType.NUMBER, int(operand1 % operand2))
-            if operator == TokenType.ADVANCED_OPERATOR_EXP:
-                return Value(TokenType.NUMBER, int(operand1 ** operand2))
-            if operator == TokenType.ADVANCED_OPERATOR_ROOT:
-                return Value(TokenType.NUMBER, int(operand2 ** (1/float(operand1))))
-        except ArithmeticError:
-            raise InterpreterError(InterpreterError.INVALID_ARITHMETIC_OPERATION, self.token.line_no,
-                                   self.get_current_line())
+            self.token = self.lexer.next_token()
+        except InterpreterError as e:
+            self.failure = Fail(e.kind, (self.lexer.line_no,) + self.lexer.line_span() + (len(self.tokens),))
+            return None
 
-    # Throws an error if there is an extra token at the end of a valid statement
-    def check_eos(self):
-        if self.token.type is not TokenType.END_OF_STATEMENT:
-            if self.next_token().type is not TokenType.END_OF_STATEMENT:
-                raise InterpreterError(InterpreterError.INVALID_SYNTAX, self.token.line_no, self.get_current_line())
+        self.tokens.append(self.token, self.lexer.token_start)
+        # Captures the previous statement for Invalid end of file error message
+        if self.token.type is not TokenType.END_OF_STATEMENT and self.token.type is not TokenType.END_OF_FILE:
+            self.prev_non_eos_site = self.get_site()
 
-    # Returns the current line being evaluated
-    def get_current_line(self): return self.lexer.line
+        return self.token
 
-    # Clears the current line
-    def clear_current_line(self): self.lexer.line = ""
 
-    # Checks if the programmar-defined identifiers are already declared
-    def variable_exists(self, name): return name in self.variables
+# LineAnalysis class that holds the tokens, statement and syntax error of a statement parsed on its own
+# A statement takes a single line, except when an operation is still incomplete after a MEAN that ends its line;
+#   the operation then reads the tokens of the next lines, so the code can hold more than one line
+# The sites are relative to the code: the first line number is 1 and the offsets and token counts start at 0
+class LineAnalysis:
+    def __init__(self, _code, _line_count):
+        self.code = _code
+        self.line_count = _line_count
+        self.tokens = TokenTable(_code)
+        parser = Parser(Lexer(_code), self.tokens)
 
-    # Creates a new variable entry to the variables dictionary
-    def declare_variable(self, name, ident_type, value):
-        if self.variable_exists(name):
-            raise InterpreterError(InterpreterError.DUPLICATE_VARIABLE, self.token.line_no, self.get_current_line())
+        self.first_site = parser.parse_line()               # Contains the site of the first token
+        self.last_site = parser.prev_non_eos_site           # Contains the site of the last token before EOS
+        self.statement = parser.statements[0] if parser.statements else None
+        self.failure = parser.failure                       # Contains the Fail node of the syntax error
+        self.first_type = None                              # Contains the token type of the first token
 
-        self.check_compatibility(ident_type, value)
+        if self.first_site is not None:
+            self.first_type = TokenType(self.tokens.types[0])
 
-        # Get the Value instance's value property if value parameter is not None
-        variable = Variable(name, ident_type, value.value if value is not None else value)
-        self.variables[name] = variable
+        # Flags that the statement read the end of the code, so it can go on in the next line
+        self.reads_next_line = parser.token is not None and parser.token.type is TokenType.END_OF_FILE
 
-        if len(name) > self.longest_variable_length:
-            self.longest_variable_length = len(name)
+    # Returns the line of a site, excluding the new line characters, as shown in the error messages
+    def get_line(self, site): return self.code[site[1]:site[2]].replace(b"\n", b"").decode("utf-8", "replace")
 
-    # Sets a value to an existing variable
-    def assign_value_variable(self, name, value):
-        if not (self.variable_exists(name)):
-            raise InterpreterError(InterpreterError.VARIABLE_NOT_DECLARED, self.token.line_no, self.get_current_line())
 
-        variable = self.get_variable(name)
+# Diagnostic class that holds a syntax error found by the IncrementalAnalyzer
+class Diagnostic:
+    def __init__(self, _line_no, _kind, _column, _line):
+        self.line_no = _line_no
+        self.kind = _kind
+        self.column = _column               # Offset in the line where the error was found
+        self.line = _line                   # Text of the line read up to the error
+
+    # Returns the error message, which is the same as the one of the interpreter
+    @property
+    def message(self): return InterpreterError(self.kind, self.line_no, self.line).message
+
+    # Returns the diagnostic as a dict that can be written as JSON
+    def to_dict(self):
+        return {"line": self.line_no, "column": self.column, "kind": self.kind, "message": self.message}
+
+
+# IncrementalAnalyzer class that keeps the analysis of each statement of a source code being edited, such as in an
+#   editor, and analyzes again only the statements of the edited lines
+# Each statement is parsed on its own; only the checks of BEGIN, END and the end of file depend on the whole program,
+#   and these are made from the first and last statements with tokens and the count of the END statements
+# Unlike the Parser, the analysis does not stop at the first error, so each statement has its own diagnostic
+class IncrementalAnalyzer:
+    def __init__(self, _code=""):
+        self.codes = []                     # Contains the code of each line, without the new line character
+        self.lines = []                     # Contains the analysis of the statement that includes each line
+        self.end_count = 0                  # Number of statements that start with END
+        self.error_count = 0                # Number of statements with a syntax error
+        self.edit(1, 0, get_source_bytes(_code).split(b"\n"))
+
+    # Replaces count lines from the given line number with new lines, then analyzes again the statements from the
+    #   line before the edited lines, until a statement starts at the same line as before
+    # The line before is analyzed again since the last line has no new line character
+    # Returns the first and last line numbers of the statements analyzed again, their diagnostics and the diagnostics
+    #   of the whole program
+    def edit(self, line_no, count, lines):
+        if not 1 <= line_no <= len(self.codes) + 1 or count < 0 or line_no - 1 + count > len(self.codes):
+            raise ValueError("the edited lines are not in the source code")
+
+        start = line_no - 1
+        stop = start + len(lines)
+        removed = {}                        # Contains the replaced analyses by their id, which are kept so that
+                                            #   their ids are not reused by the new analyses
+
+        for analysis in self.lines[start:start + count]:
+            self.remove_analysis(analysis, removed)
+
+        self.codes[start:start + count] = [get_source_bytes(line) for line in lines]
+        self.lines[start:start + count] = [None] * len(lines)
+
+        first = index = self.get_statement_start(max(start - 1, 0))
+
+        while index < len(self.codes):
+            # The statements after the edited lines are kept once one starts at the same line as before; a statement
+            #   that is not replaced yet starts at this line, since the lines before are already analyzed again
+            if index >= stop and id(self.lines[index]) not in removed:
+                break
+
+            analysis = self.analyze(index)
+
+            for old_analysis in self.lines[index:index + analysis.line_count]:
+                self.remove_analysis(old_analysis, removed)
+            self.lines[index:index + analysis.line_count] = [analysis] * analysis.line_count
+            self.count_analysis(analysis, 1)
+
+            index += analysis.line_count
+
+        return first + 1, index, self.get_line_diagnostics(first, index), self.get_program_diagnostics()
+
+    # Returns the analysis of the statement that starts at the line of the given index
+    # The next lines are added one by one while the statement reads past the end of the lines given
+    def analyze(self, index):
+        count = 1
+
+        while True:
+            last = index + count == len(self.codes)
+            code = b"\n".join(self.codes[index:index + count])
+
+            analysis = LineAnalysis(code if last else code + b"\n", count)
+            if last or not analysis.reads_next_line:
+                return analysis
+
+            count += 1
+
+    # Returns the index of the line where the statement that includes the line of the given index starts
+    def get_statement_start(self, index):
+        while 0 < index < len(self.lines) and self.lines[index] is not None and \
+                self.lines[index] is self.lines[index - 1]:
+            index -= 1
+        return index
+
+    # Removes an analysis that is replaced from the counts, once
+    def remove_analysis(self, analysis, removed):
+        if analysis is not None and id(analysis) not in removed:
+            removed[id(analysis)] = analysis
+            self.count_analysis(analysis, -1)
+
+    # Adds an analysis to the counts of END statements and statements with errors, or removes it if sign is -1
+    def count_analysis(self, analysis, sign):
+        if analysis.first_type is TokenType.PROGRAM_END:
+            self.end_count += sign
+        if analysis.failure is not None:
+            self.error_count += sign
+
+    # Returns the diagnostics of the whole source code, ordered by line number
+    def get_diagnostics(self):
+        diagnostics = self.get_program_diagnostics()
+
+        if self.error_count > 0:
+            diagnostics += self.get_line_diagnostics(0, len(self.lines))
+
+        return sorted(diagnostics, key=lambda diagnostic: diagnostic.line_no)
+
+    # Returns the syntax errors of the statements that start from the start index to the stop index of the lines
+    def get_line_diagnostics(self, start, stop):
+        diagnostics = []
+
+        for index in self.get_statement_starts(start, stop):
+            failure = self.lines[index].failure
+
+            if failure is not None:
+                diagnostics.append(self.get_diagnostic(index, failure.message, failure.site))
+
+        return diagnostics
+
+    # Returns the indexes of the lines where the statements start, from the start index to the stop index
+    def get_statement_starts(self, start, stop):
+        index = start
+
+        while index < stop:
+            yield index
+            index += self.lines[index].line_count
+
+    # Returns the errors that depend on the whole program: a first statement that is not BEGIN, an END after the
+    #   first END, and a missing END at the end of file
+    def get_program_diagnostics(self):
+        diagnostics = []
+
+        # A statement with an error on its first token has no tokens, but the parsing still stops there
+        first = next((index for index in self.get_statement_starts(0, len(self.lines))
+                      if self.lines[index].first_site is not None or self.lines[index].failure is not None), None)
+        if first is None:
+            return diagnostics
+
+        analysis = self.lines[first]
+        if analysis.first_type is not None and analysis.first_type is not TokenType.PROGRAM_BEGIN:
+            diagnostics.append(self.get_diagnostic(first, InterpreterError.INVALID_SYNTAX, analysis.first_site))
+
+        # The END statements are only searched when there is more than one
+        if self.end_count > 1:
+            ends = [index for index in self.get_statement_starts(0, len(self.lines))
+                    if self.lines[index].first_type is TokenType.PROGRAM_END]
+
+            for index in ends[1:]:
+                diagnostics.append(self.get_diagnostic(index, InterpreterError.INVALID_SYNTAX,
+                                                       self.lines[index].first_site))
+
+        if self.end_count == 0:
+            last = next((index for index in reversed(range(len(self.lines)))
+                         if self.lines[index].last_site is not None), None)
+
+            if last is not None:
+                start = self.get_statement_start(last)
+                diagnostics.append(self.get_diagnostic(start, InterpreterError.INVALID_EOF,
+                                                       self.lines[start].last_site))
+
+        return diagnostics
+
+    # Returns the diagnostic of an error at a site of the statement that starts at the line of the given index
+    def get_diagnostic(self, index, kind, site):
+        return Diagnostic(index + site[0], kind, site[2] - site[1], self.lines[index].get_line(site))
+
+
+# Optimizer class that simplifies the expressions of a parsed program before it is compiled
+# Operations on literal values are folded into their value, and operations with an identity operand
+#   (ADD x 0, ADD 0 x, SUB x 0, MUL x 1, MUL 1 x, RAISE x 1) are replaced by the other operand
+# Operations that raise an error are kept as they are, so that the error is still raised at its site once reached
+class Optimizer:
+    max_bit_length = 4096               # Folded values are kept within this size to keep the programs small
+
+    def __init__(self, _program):
+        self.program = _program
+
+    # Returns a new program with the simplified expressions of all the statements
+    def optimize(self):
+        statements = []
+
+        for statement in self.program.statements:
+            if type(statement) in (Output, Declaration, Assignment, Evaluation):
+                statement = copy.copy(statement)
+                statement.expression = run_nested(self.fold(statement.expression))
+            statements.append(statement)
+
+        self.mark_common_subexpressions(statements)
+
+        return Program(self.program.code, statements)
+
+    # Gives the same key to the identical operations that appear more than once in the program, so that the
+    #   Interpreter computes them once until one of their variables is assigned
+    # Each operation keeps its own site, so that an error is still raised at the site where it is reached
+    def mark_common_subexpressions(self, statements):
+        keys = {}
+        counts = []
+        nodes = []
+
+        for statement in statements:
+            if type(statement) in (Output, Declaration, Assignment, Evaluation):
+                run_nested(self.get_key(statement.expression, keys, counts, nodes))
+
+        for node in nodes:
+            if counts[node.key] == 1:
+                node.key = None
+
+    # Returns the key of the expression; equal keys are given to identical expressions
+    # A generator run by run_nested, which yields the generator of each operand and receives its key
+    # An operation with an incomplete operand has no key since it always raises its error
+    def get_key(self, node, keys, counts, nodes):
+        if type(node) is Literal:
+            return node.value.type, node.value.value
+        if type(node) is Identifier:
+            return node.name
+        if type(node) is not Arithmetic:
+            return None
+
+        operand_keys = []
+        for operand in node.operands:
+            operand_keys.append((yield self.get_key(operand, keys, counts, nodes)))
+
+        if None in operand_keys:
+            return None
+
+        structure = (node.operator, tuple(operand_keys))
+        node.key = keys.setdefault(structure, len(keys))
+        names = {}
+        for operand in node.operands:
+            if type(operand) is Identifier:
+                names[operand.name] = None
+            elif type(operand) is Arithmetic:
+                names.update(dict.fromkeys(operand.names))
+        node.names = tuple(names)
+
+        if node.key == len(counts):
+            counts.append(0)
+        counts[node.key] += 1
+        nodes.append(node)
+
+        return node.key
+
+    # Simplifies the expression; a generator run by run_nested, which yields the generator of each nested operation
+    #   and receives the simplified operation
+    # The value of an operand is always converted to int, so variables can only replace operands
+    def fold(self, node, operand=False):
+        if type(node) is not Arithmetic:
+            return node
+
+        operand_nodes = []
+        for operand_node in node.operands:
+            if type(operand_node) is Arithmetic:
+                operand_node = yield self.fold(operand_node, True)
+            operand_nodes.append(operand_node)
+
+        node = Arithmetic(node.operator, operand_nodes, node.site)
+        operands = [self.get_number(operand_node) for operand_node in node.operands]
+
+        if None not in operands:
+            value = self.compute(node.operator, operands)
+
+            if value is not None:
+                return Literal(get_number_value(value), node.site)
+            return node
+
+        if len(operands) != 2 or node.operator not in identity_operands:
+            return node
+
+        identity = identity_operands[node.operator]
+        left, right = node.operands
+
+        if operands[1] == identity and (type(left) is Arithmetic or operand and type(left) is Identifier):
+            return left
+        if operands[0] == identity and node.operator in commutative_operators and \
+                (type(right) is Arithmetic or operand and type(right) is Identifier):
+            return right
+
+        return node
+
+    # Returns the int value of a number literal, or None if it is not a number literal
+    @staticmethod
+    def get_number(node):
+        if type(node) is not Literal:
+            return None
+        return node.value.number
 
-        self.check_compatibility(variable.type, value)
+    # Returns the value of the operation, or None if it raises an error or its value is too large
+    def compute(self, operator, operands):
+        if operator is TokenType.ADVANCED_OPERATOR_EXP and operands[1] > 0 and \
+                operands[0].bit_length() * operands[1] > self.max_bit_length:
+            return None
 
-        variable.value = value.value
-        self.variables[name] = variable
+        try:
+            value = Interpreter.arithmetic(operator, operands).value
+        # A TypeError is raised by the ROOT of a negative number, which is also left to be raised once reached
+        except (ArithmeticError, TypeError):
+            return None
 
-    # Checks if the value's type is the expected data type
-    def check_compatibility(self, expected_data_type, value):
-        if value is not None and expected_data_type is not value.type:
-            raise InterpreterError(InterpreterError.INCOMPATIBLE_DATA_TYPE, self.token.line_no, self.get_current_line())
+        if value.bit_length() > self.max_bit_length:
+            return None
 
-    # Returns the variable instance given the variable name
-    def get_variable(self, name): return self.variables.get(name)
+        return value
 
-    # Returns the next token from the lexer
-    def next_token(self):
-        self.token = self.lexer.next_token()
 
-        if self.token is not None:
-            self.tokens.append(self.token)
-            # Captures the previous statement for Invalid end of file error message
-            if self.token.type is not TokenType.END_OF_STATEMENT and self.token.type is not TokenType.END_OF_FILE:
-                self.prev_non_eos_line = self.get_current_line()
-                self.prev_non_eos_lineno = self.token.line_no
+# Operand of each operation that gives the other operand as value
+identity_operands = {TokenType.BASIC_OPERATOR_ADD: 0, TokenType.BASIC_OPERATOR_SUB: 0,
+                     TokenType.BASIC_OPERATOR_MUL: 1, TokenType.ADVANCED_OPERATOR_EXP: 1}
 
-        return self.token
+# Operations where the identity operand can also be the first operand
+commutative_operators = (TokenType.BASIC_OPERATOR_ADD, TokenType.BASIC_OPERATOR_MUL)
 
 
-# Main method executed when the script is called
-def main():
-    welcome_message = "========  INTERPOL INTERPRETER STARTED   ========\n"
-    output_message = "\n================ INTERPOL OUTPUT ================\n"
-    output_message_start = "----------------  OUTPUT START  ---------------->"
-    output_message_end = "\n<----------------- OUTPUT END -------------------"
-    token_list_header = "\n========= INTERPOL LEXEMES/TOKENS TABLE =========\n"
-    token_list_columns = "LINE NO.  TOKENS                          LEXEMES"
-    symbol_list_header = "\n================= SYMBOLS TABLE =================\n"
-    symbol_list_columns = "VARIABLE NAME       TYPE        VALUE"
-    termination_message = "\n======== INTERPOL INTERPRETER TERMINATED ========"
+# ExecutionLimits class that holds the limits of each run of a program; None means no limit
+# Each arithmetic operation is checked before it is computed: the number of operations computed so far, the bit
+#   length of its value and the time since the run started
+class ExecutionLimits:
+    def __init__(self, _operations=None, _bit_length=None, _timeout=None):
+        self.operations = _operations       # Maximum number of arithmetic operations computed by a run
+        self.bit_length = _bit_length       # Maximum bit length of the value of an arithmetic operation
+        self.timeout = _timeout             # Maximum number of seconds of a run
 
-    print(welcome_message)
 
-    file_path = input("Enter INTERPOL file (.ipol): ")
-    contents = None
+# OutputWriter class that keeps the output in a buffer and writes it to a stream: a file, a pipe or an in-memory
+#   buffer such as io.StringIO
+# The buffer is written to the stream depending on the flush policy: after each new line ("line"), once the buffer
+#   reaches the buffer size ("size"), or only when the program ends ("end")
+# The buffer is also written before an INPUT statement reads a value, so that the prompt is displayed first
+class OutputWriter:
+    policies = ["line", "size", "end"]
+    default_buffer_size = 1 << 16
 
-    # Use the path relative to this script if path is not absolute
-    if not os.path.isabs(file_path):
-        file_path = pathlib.Path(str(pathlib.Path(__file__).parent.absolute()), file_path)
+    def __init__(self, _stream, _policy="size", _buffer_size=None):
+        self.stream = _stream
+        self.policy = _policy
+        self.buffer_size = _buffer_size if _buffer_size is not None else self.default_buffer_size
+        self.buffer = []
+        self.size = 0                       # Contains the number of characters in the buffer
 
-    # Check if the file extension is correct
-    if not pathlib.Path(file_path).suffix == ".ipol":
-        print(InterpreterError.INVALID_FILE)
+    # Adds the text to the buffer, then writes the buffer if the flush policy requires it
+    def write(self, text):
+        self.buffer.append(text)
+        self.size += len(text)
 
-    # Check if the file exists
-    elif not os.path.isfile(file_path):
-        print(InterpreterError.FILE_NOT_FOUND)
+        if self.policy == "line" and text.endswith("\n") or \
+                self.policy == "size" and self.size >= self.buffer_size:
+            self.flush()
 
-    # Check if the file has contents
-    elif not os.path.getsize(file_path) > 0:
-        print(InterpreterError.FILE_EMPTY)
+    # Adds the value followed by the end text, like the print function
+    def print(self, value, end="\n"):
+        self.write(str(value) + end)
 
-    else:
-        # Open the file in read mode using utf-8 encoding to avoid encoding errors
-        file = open(file_path, 'r', encoding='utf-8')
-        contents = file.read()
+    # Writes the buffer to the stream
+    def flush(self):
+        if self.buffer:
+            self.stream.write("".join(self.buffer))
+            self.buffer = []
+            self.size = 0
 
-    if contents is not None:
-        print(output_message)
-        print(output_message_start)
+        self.stream.flush()
 
-        # Source code passed to lexer to be tokenized
-        lexer = Lexer(contents)
-        # lexer instance passed to parser, which processes each token
-        parser = Parser(lexer)
-        # Starts the parsing process
-        parser.execute()
 
-        print(output_message_end)
+# ConsoleInput class that reads the INPUT values typed in the standard input
+class ConsoleInput:
+    interactive = True                  # Flags that the values are typed by the user after a prompt
 
-        # Display all tokens only if there are tokens available
-        if len(parser.tokens) > 0:
-            print(token_list_header)
-            print(token_list_columns)
+    # Returns the next value
+    def read(self): return input()
 
-            for token in parser.tokens:
-                print(str(token.line_no).ljust(10) + TokenType(token.type).name.ljust(32) + token.value)
 
-        # Display all symbols only if there are symbols available
-        if len(parser.variables) > 0:
-            varname_ljust = 20
+# ListInput class that reads the INPUT values from a list, such as the lines of a file or a row of a CSV file
+# Reading more values than the list has raises EOFError, as reading past the end of the standard input does
+class ListInput:
+    interactive = False
 
-            # Adjusts the column width depending on the largest variable name
-            if parser.longest_variable_length >= varname_ljust:
-                varname_ljust = varname_ljust + (parser.longest_variable_length - varname_ljust + 1)
-                symbol_list_columns = "VARIABLE NAME".ljust(varname_ljust) + "TYPE".ljust(12) + "VALUE"
+    def __init__(self, _values):
+        self.values = _values
+        self.index = 0                      # Index of the next value
 
-            print(symbol_list_header)
-            print(symbol_list_columns)
+    # Returns the next value
+    def read(self):
+        if self.index >= len(self.values):
+            raise EOFError("EOF when reading a line")
+
+        self.index += 1
+        return self.values[self.index - 1]
+
+
+# Returns the INPUT values of a file, which has one value per line
+def read_input_values(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        return file.read().splitlines()
+
+
+# Interpreter class that executes the statements of a parsed program
+class Interpreter:
+    def __init__(self, _program, _output=None, _inputs=None, _limits=None):
+        self.program = _program
+        self.output = _output if _output is not None else OutputWriter(sys.stdout)
+        self.inputs = _inputs if _inputs is not None else ConsoleInput()
+        self.limits = _limits
+        self.operation_count = 0            # Contains the number of arithmetic operations computed
+        self.deadline = None                # Contains the time when the run exceeds its timeout
+        self.variables = {}
+        self.prev_print_has_newline = True  # Flags that previous PRINT statement has a newline affixed to it
+        self.longest_variable_length = 0    # Contains the longest variable name length for symbols table
+        self.token_count = None             # Contains the number of tokens read when an error is raised
+        self.exception = None               # Contains the error that stopped the execution
+        self.memo = {}                      # Contains the value of each computed operation key
+        self.memo_keys = {}                 # Contains the computed operation keys that read each variable
 
-            for variable in parser.variables:
-                var = parser.variables[variable]
-                typ = "INTEGER" if var.type is TokenType.NUMBER else "STRING"
-                val = "" if var.value is None else str(var.value)
-                # Adjusts the column width depending on the largest variable name
-                print(str(var.name).ljust(varname_ljust) + str(typ).ljust(12) + val)
+        if _limits is not None and _limits.timeout is not None:
+            self.deadline = time.monotonic() + _limits.timeout
 
-    print(termination_message, end="")
+    # Main interpreter logic that executes each statement
+    def execute(self):
+        try:
+            for statement in self.program.statements:
+                self.execute_statement(statement)
+
+        except InterpreterError as e:
+            self.show_error(e)
+        finally:
+            self.output.flush()
+
+    # Executes a statement by calling its corresponding method
+    def execute_statement(self, statement):
+        if type(statement) is Output:
+            self.print(statement)
+        elif type(statement) is Declaration:
+            self.assign(statement)
+        elif type(statement) is Assignment:
+            self.store(statement)
+        elif type(statement) is Input:
+            self.input(statement)
+        elif type(statement) is Evaluation:
+            self.evaluate_expression(statement.expression)
+        else:
+            self.evaluate_expression(statement)
+
+    # Evaluates the expression to reach its value
+    # Nested operations are kept in a list of pending operations with the numbers of their evaluated operands,
+    #   instead of recursion, so operations of any depth use a constant depth of the Python stack
+    def evaluate_expression(self, node):
+        if type(node) is not Arithmetic:
+            return self.evaluate_value(node)
+
+        value = self.get_memo(node)
+        if value is not None:
+            return value
+
+        pending = [(node, [])]
+
+        while True:
+            node, operands = pending[-1]
+
+            if len(operands) < len(node.operands):
+                operand = node.operands[len(operands)]
+
+                if type(operand) is Arithmetic:
+                    value = self.get_memo(operand)
+                    # The operation is evaluated first, then its value is added to the operands
+                    if value is None:
+                        pending.append((operand, []))
+                        continue
+                else:
+                    value = self.evaluate_value(operand)
+                    self.check_compatibility(TokenType.NUMBER, value, operand.site)
+
+                operands.append(value.number)
+                continue
+
+            pending.pop()
+            value = self.compute_operation(node, operands)
+
+            if not pending:
+                return value
+            pending[-1][1].append(value.number)
+
+    # Evaluates a literal value, a variable or the error of an incomplete expression
+    def evaluate_value(self, node):
+        if type(node) is Literal:
+            return node.value
+
+        if type(node) is Identifier:
+            variable = self.get_variable(node.name)
+
+            if variable is None:
+                raise self.error(InterpreterError.VARIABLE_NOT_DECLARED, node.site)
+
+            if node.checked:
+                self.check_compatibility(TokenType.NUMBER, variable, node.site)
+
+            # If the variable has no value yet, it is an expression error
+            if variable.value is None:
+                raise self.error(InterpreterError.INVALID_EXPRESSION, node.site)
+
+            return variable
+
+        raise self.error(node.message, node.site)
+
+    # Returns the computed value of an operation that appears more than once, until one of its variables is assigned
+    def get_memo(self, node):
+        if node.key is not None:
+            return self.memo.get(node.key)
+        return None
+
+    # Computes the operation from the numbers of its operands
+    def compute_operation(self, node, operands):
+        if self.limits is not None and self.exceeds_limits(node.operator, operands):
+            raise self.error(InterpreterError.LIMIT_EXCEEDED, node.site)
+
+        try:
+            value = self.arithmetic(node.operator, operands)
+        except ArithmeticError:
+            raise self.error(InterpreterError.INVALID_ARITHMETIC_OPERATION, node.site)
+
+        if node.key is not None:
+            self.memo[node.key] = value
+            for name in node.names:
+                self.memo_keys.setdefault(name, []).append(node.key)
+
+        return value
+
+    # Executes the INPUT statement
+    def input(self, statement):
+        input_value = self.read_value()
+
+        typ, number = Lexer.get_number(input_value)
+        # A floating-point value
+        if typ == 1:
+            raise self.error(InterpreterError.INVALID_DATA_TYPE_INPUT, statement.site)
+        # An integer
+        elif typ == 0:
+            input_type = TokenType.NUMBER
+        # A string
+        else:
+            input_type = TokenType.STRING
+
+            if not Lexer.is_printable_ascii_string(input_value):
+                raise self.error(InterpreterError.INVALID_SYNTAX, statement.site)
+
+        if statement.assign_site is not None:
+            self.assign_value_variable(statement.name, Value(input_type, input_value, number), statement.assign_site)
+
+    # Executes the STORE statement
+    def store(self, statement):
+        self.assign_value_variable(statement.name, self.evaluate_expression(statement.expression), statement.site)
+
+    # Executes the VARINT and VARSTR statements
+    def assign(self, statement):
+        value = None
+
+        if statement.expression is not None:
+            value = self.evaluate_expression(statement.expression)
+
+        self.declare_variable(statement.name, statement.type, value, statement.site)
+
+    # Executes the PRINT and PRINTLN statements
+    def print(self, statement):
+        value = self.evaluate_expression(statement.expression)
+
+        self.output.print(value.value, statement.end)
+
+        self.prev_print_has_newline = statement.end == "\n"
+
+    # Computes the arithmetic operation of the operands
+    @staticmethod
+    def arithmetic(operator, operands):
+        # Computes for: MEAN <expr1> <expr2> <expr3> … <exprn>
+        if operator is TokenType.ADVANCED_OPERATOR_AVE:
+            return get_number_value(int(sum(operands)/len(operands)))
+        # Computes for: DIST <expr1> <expr2> AND <expr3> <expr4>
+        if operator is TokenType.ADVANCED_OPERATOR_DIST:
+            expr1, expr2, expr3, expr4 = operands
+            return get_number_value(int((((expr4-expr2)**2)+((expr3-expr1)**2))**(1/2)))
+
+        return Interpreter.two_operators_arithmetic(operator, operands[0], operands[1])
+
+    # Handles arithmetic operations with only two parameters
+    # Computes these operations:
+    #   ADD <expression1> <expression2>
+    #   SUB <expression1> <expression2>
+    #   MUL <expression1> <expression2>
+    #   DIV <expression1> <expression2>
+    #   MOD <expression1> <expression2>
+    #   RAISE <expression> <exponent>
+    #   ROOT <N> <expression>
+    @staticmethod
+    def two_operators_arithmetic(operator, operand1, operand2):
+        if operator == TokenType.BASIC_OPERATOR_ADD:
+            return get_number_value(operand1 + operand2)
+        if operator == TokenType.BASIC_OPERATOR_SUB:
+            return get_number_value(operand1 - operand2)
+        if operator == TokenType.BASIC_OPERATOR_MUL:
+            return get_number_value(operand1 * operand2)
+        if operator == TokenType.BASIC_OPERATOR_DIV:
+            return get_number_value(int(operand1 / operand2))
+        if operator == TokenType.BASIC_OPERATOR_MOD:
+            return get_number_value(int(operand1 % operand2))
+        if operator == TokenType.ADVANCED_OPERATOR_EXP:
+            return get_number_value(int(operand1 ** operand2))
+        if operator == TokenType.ADVANCED_OPERATOR_ROOT:
+            return get_number_value(int(operand2 ** (1/float(operand1))))
+
+    # Returns True if computing the operation would exceed one of the execution limits of the run
+    def exceeds_limits(self, operator, operands):
+        limits = self.limits
+        self.operation_count += 1
+
+        if limits.operations is not None and self.operation_count > limits.operations:
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            return True
+
+        return limits.bit_length is not None and self.get_bit_length(operator, operands) > limits.bit_length
+
+    # Returns the bit length that the value of the operation can reach, without computing it
+    # The values of DIV, MOD, ROOT, MEAN and DIST are never larger than their operands
+    @staticmethod
+    def get_bit_length(operator, operands):
+        if operator is TokenType.BASIC_OPERATOR_ADD or operator is TokenType.BASIC_OPERATOR_SUB:
+            return max(operands[0].bit_length(), operands[1].bit_length()) + 1
+        if operator is TokenType.BASIC_OPERATOR_MUL:
+            return operands[0].bit_length() + operands[1].bit_length()
+        if operator is TokenType.ADVANCED_OPERATOR_EXP:
+            base, exponent = operands
+
+            if exponent <= 0 or abs(base) <= 1:
+                return 1
+            # The value of an exponent too large for a float has at least as many bits as the exponent
+            if exponent.bit_length() > 64:
+                return exponent
+
+            return int(exponent * math.log2(abs(base))) + 1
+
+        return 0
+
+    # Reads the value of an INPUT statement; the output is written first so that its prompt is displayed if the
+    #   value is typed by the user
+    def read_value(self):
+        if self.inputs.interactive:
+            self.output.flush()
+        return self.inputs.read()
+
+    # Displays the error that stopped the execution
+    def show_error(self, e):
+        self.exception = e
+        # Display the error message and prefix a newline if previous print has no newline
+        self.output.write(('\n' if not self.prev_print_has_newline else '') + str(e))
+
+    # Returns the error to be raised at the given site, and keeps the number of tokens read up to that site
+    def error(self, message, site):
+        self.token_count = site[3]
+        return InterpreterError(message, site[0], self.program.get_line(site))
+
+    # Checks if the programmar-defined identifiers are already declared
+    def variable_exists(self, name): return name in self.variables
+
+    # Creates a new variable entry to the variables dictionary
+    def declare_variable(self, name, ident_type, value, site):
+        if self.variable_exists(name):
+            raise self.error(InterpreterError.DUPLICATE_VARIABLE, site)
+
+        self.check_compatibility(ident_type, value, site)
+
+        # Get the Value instance's value property if value parameter is not None
+        variable = Variable(name, ident_type, value.value, value.number) if value is not None else \
+            Variable(name, ident_type, None)
+        self.variables[name] = variable
+
+        if len(name) > self.longest_variable_length:
+            self.longest_variable_length = len(name)
+
+    # Sets a value to an existing variable
+    def assign_value_variable(self, name, value, site):
+        if not (self.variable_exists(name)):
+            raise self.error(InterpreterError.VARIABLE_NOT_DECLARED, site)
+
+        variable = self.get_variable(name)
+
+        self.check_compatibility(variable.type, value, site)
+
+        variable.value = value.value
+        variable.number = value.number
+
+        # The computed operations that read the variable are computed again once reached
+        for key in self.memo_keys.pop(name, ()):
+            self.memo.pop(key, None)
+
+    # Checks if the value's type is the expected data type
+    def check_compatibility(self, expected_data_type, value, site):
+        if value is not None and expected_data_type is not value.type:
+            raise self.error(InterpreterError.INCOMPATIBLE_DATA_TYPE, site)
+
+    # Returns the variable instance given the variable name
+    def get_variable(self, name): return self.variables.get(name)
+
+    # Fills the variables dictionary with the declared variables of a compiled program, given the name,
+    #   data type and value of each variable slot
+    def set_slot_variables(self, names, slot_types, values):
+        for slot, name in enumerate(names):
+            if values[slot] is not undeclared:
+                self.variables[name] = Variable(name, slot_types[slot], values[slot])
+
+                if len(name) > self.longest_variable_length:
+                    self.longest_variable_length = len(name)
+
+
+# Opcodes of the VirtualMachine; each instruction is an opcode followed by its argument
+OP_LOAD_CONST = 0           # Pushes the constant at the argument index
+OP_LOAD_NUMBER = 1          # Pushes the integer value of the variable at the argument slot
+OP_LOAD_VAR = 2             # Pushes the value of the variable at the argument slot
+OP_ADD = 3
+OP_SUB = 4
+OP_MUL = 5
+OP_DIV = 6
+OP_MOD = 7
+OP_RAISE = 8
+OP_ROOT = 9
+OP_MEAN = 10                # Pushes the mean of the argument count of values
+OP_DIST = 11
+OP_PRINT = 12               # Prints the value; the argument is 1 if a new line is affixed to it
+OP_POP = 13
+OP_DECLARE = 14             # Declares the variable at the argument slot with the value
+OP_STORE = 15               # Stores the value to the variable at the argument slot
+OP_INPUT = 16               # Reads the value of the variable at the argument slot; discarded if the slot is -1
+OP_INCOMPATIBLE = 17        # Same as OP_LOAD_NUMBER or OP_STORE on a variable of the wrong data type
+OP_DECLARE_INCOMPATIBLE = 18    # Same as OP_DECLARE with a value of the wrong data type
+OP_FAIL = 19                # Raises the error message at the argument index
+
+
+# Bytecode class that holds the compiled program run by the VirtualMachine
+class Bytecode:
+    def __init__(self, _program, _code, _constants, _sites, _names, _slot_types):
+        self.program = _program
+        self.code = _code                   # Opcode array
+        self.constants = _constants
+        self.sites = _sites                 # Contains the error site of each instruction that can raise an error
+        self.names = _names                 # Contains the variable name of each slot
+        self.slot_types = _slot_types       # Contains the data type of each slot, None if never declared
+
+
+# Compiler class that translates a parsed program into the opcodes run by the VirtualMachine
+# Variables are given slots in the order of their first declaration, which is also the data type of the variable
+#   since the statements are always executed in order
+class Compiler:
+    def __init__(self, _program):
+        self.program = _program
+        self.code = []
+        self.constants = []
+        self.constant_indexes = {}
+        self.sites = {}
+        self.slots = {}
+        self.names = []
+        self.slot_types = []
+
+    # Compiles all the statements of the program
+    def compile(self):
+        for statement in self.program.statements:
+            if type(statement) is Declaration and statement.name not in self.slots:
+                self.get_slot(statement.name, statement.type)
+
+        for statement in self.program.statements:
+            if type(statement) is Output:
+                self.compile_expression(statement.expression)
+                self.emit(OP_PRINT, 1 if statement.end == "\n" else 0)
+
+            elif type(statement) is Declaration:
+                if statement.expression is None:
+                    self.emit(OP_LOAD_CONST, self.get_constant(None))
+                    typ = statement.type
+                else:
+                    typ = self.compile_expression(statement.expression)
+                self.emit(OP_DECLARE if typ is statement.type else OP_DECLARE_INCOMPATIBLE,
+                          self.get_slot(statement.name), statement.site)
+
+            elif type(statement) is Assignment:
+                typ = self.compile_expression(statement.expression)
+                slot = self.get_slot(statement.name)
+                self.emit(OP_STORE if typ is self.slot_types[slot] else OP_INCOMPATIBLE, slot, statement.site)
+
+            elif type(statement) is Input:
+                slot = -1 if statement.assign_site is None else self.get_slot(statement.name)
+                self.emit(OP_INPUT, slot, (statement.site, statement.assign_site))
+
+            elif type(statement) is Evaluation:
+                self.compile_expression(statement.expression)
+                self.emit(OP_POP, 0)
+
+            else:
+                self.compile_expression(statement)
+
+        return Bytecode(self.program, self.code, self.constants, self.sites, self.names, self.slot_types)
+
+    # Compiles the expression; returns the data type of its value
+    # Operands of arithmetic operations are compiled to push integer values
+    def compile_expression(self, node, operand=False):
+        if type(node) is Arithmetic:
+            return run_nested(self.compile_operation(node))
+        return self.compile_value(node, operand)
+
+    # Compiles a literal value, a variable or the error of an incomplete expression
+    def compile_value(self, node, operand):
+        if type(node) is Literal:
+            if not operand:
+                self.emit(OP_LOAD_CONST, self.get_constant(node.value.value))
+            elif node.value.type is TokenType.NUMBER:
+                self.emit(OP_LOAD_CONST, self.get_constant(node.value.number))
+            else:
+                self.emit(OP_FAIL, self.get_constant(InterpreterError.INCOMPATIBLE_DATA_TYPE), node.site)
+            return node.value.type
+
+        if type(node) is Identifier:
+            slot = self.get_slot(node.name)
+
+            if not node.checked:
+                self.emit(OP_LOAD_VAR, slot, node.site)
+            elif self.slot_types[slot] is TokenType.STRING:
+                self.emit(OP_INCOMPATIBLE, slot, node.site)
+            else:
+                self.emit(OP_LOAD_NUMBER, slot, node.site)
+            return self.slot_types[slot]
+
+        self.emit(OP_FAIL, self.get_constant(node.message), node.site)
+        return None
+
+    # Compiles the operation; a generator run by run_nested, which yields the generator of each nested operation
+    def compile_operation(self, node):
+        for operand_node in node.operands:
+            if type(operand_node) is Arithmetic:
+                yield self.compile_operation(operand_node)
+            else:
+                self.compile_value(operand_node, True)
+
+        # An incomplete operation always fails on its last operand
+        if node.operands and type(node.operands[-1]) is Fail:
+            return None
+
+        if node.operator is TokenType.ADVANCED_OPERATOR_AVE:
+            self.emit(OP_MEAN, len(node.operands), node.site)
+        else:
+            self.emit(arithmetic_opcodes[node.operator], 0, node.site)
+        return TokenType.NUMBER
+
+    # Adds an instruction and the site of the error it can raise
+    def emit(self, opcode, argument, site=None):
+        if site is not None:
+            self.sites[len(self.code)] = site
+        self.code.append(opcode)
+        self.code.append(argument)
+
+    # Returns the index of the constant, adding it to the constants if it is new
+    def get_constant(self, value):
+        key = (type(value), value)
+        if key not in self.constant_indexes:
+            self.constant_indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return self.constant_indexes[key]
+
+    # Returns the slot of the variable, adding it to the slots if it is new
+    def get_slot(self, name, typ=None):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+            self.slot_types.append(typ)
+        return self.slots[name]
+
+
+# Opcodes of the arithmetic operations with fixed number of operands
+arithmetic_opcodes = {TokenType.BASIC_OPERATOR_ADD: OP_ADD, TokenType.BASIC_OPERATOR_SUB: OP_SUB,
+                      TokenType.BASIC_OPERATOR_MUL: OP_MUL, TokenType.BASIC_OPERATOR_DIV: OP_DIV,
+                      TokenType.BASIC_OPERATOR_MOD: OP_MOD, TokenType.ADVANCED_OPERATOR_EXP: OP_RAISE,
+                      TokenType.ADVANCED_OPERATOR_ROOT: OP_ROOT, TokenType.ADVANCED_OPERATOR_DIST: OP_DIST}
+
+# Operator of each arithmetic opcode
+opcode_operators = {opcode: operator for operator, opcode in arithmetic_opcodes.items()}
+opcode_operators[OP_MEAN] = TokenType.ADVANCED_OPERATOR_AVE
+
+# Value of the variables that are not yet declared
+undeclared = object()
+
+
+# VirtualMachine class that runs the compiled program in a single dispatch loop over a stack of values
+class VirtualMachine(Interpreter):
+    def __init__(self, _bytecode, _output=None, _inputs=None, _limits=None):
+        super().__init__(_bytecode.program, _output, _inputs, _limits)
+        self.bytecode = _bytecode
+        self.values = [undeclared] * len(_bytecode.names)
+
+    # Runs the compiled program, then fills the variables dictionary for the symbols table
+    def execute(self):
+        try:
+            self.run()
+        except InterpreterError as e:
+            self.show_error(e)
+        finally:
+            self.output.flush()
+
+        self.set_slot_variables(self.bytecode.names, self.bytecode.slot_types, self.values)
+
+    # Dispatch loop of the instructions
+    def run(self):
+        code = self.bytecode.code
+        constants = self.bytecode.constants
+        slot_types = self.bytecode.slot_types
+        values = self.values
+        output = self.output.print
+        limits = self.limits
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        end = len(code)
+
+        try:
+            while pc < end:
+                opcode = code[pc]
+                argument = code[pc + 1]
+                pc += 2
+
+                if limits is not None and OP_ADD <= opcode <= OP_DIST:
+                    self.check_limits(opcode, argument, stack, pc - 2)
+
+                if opcode == OP_LOAD_CONST:
+                    push(constants[argument])
+                elif opcode == OP_LOAD_NUMBER:
+                    value = values[argument]
+                    if value is undeclared or value is None:
+                        self.check_variable(pc - 2, value)
+                    push(int(value))
+                elif opcode == OP_ADD:
+                    operand2 = pop()
+                    stack[-1] = stack[-1] + operand2
+                elif opcode == OP_SUB:
+                    operand2 = pop()
+                    stack[-1] = stack[-1] - operand2
+                elif opcode == OP_MUL:
+                    operand2 = pop()
+                    stack[-1] = stack[-1] * operand2
+                elif opcode == OP_DIV:
+                    operand2 = pop()
+                    stack[-1] = int(stack[-1] / operand2)
+                elif opcode == OP_MOD:
+                    operand2 = pop()
+                    stack[-1] = int(stack[-1] % operand2)
+                elif opcode == OP_RAISE:
+                    operand2 = pop()
+                    stack[-1] = int(stack[-1] ** operand2)
+                elif opcode == OP_ROOT:
+                    operand2 = pop()
+                    stack[-1] = int(operand2 ** (1/float(stack[-1])))
+                elif opcode == OP_MEAN:
+                    operands = stack[len(stack) - argument:]
+                    del stack[len(stack) - argument:]
+                    push(int(sum(operands)/len(operands)))
+                elif opcode == OP_DIST:
+                    expr4 = pop()
+                    expr3 = pop()
+                    expr2 = pop()
+                    expr1 = pop()
+                    push(int((((expr4-expr2)**2)+((expr3-expr1)**2))**(1/2)))
+                elif opcode == OP_LOAD_VAR:
+                    value = values[argument]
+                    if value is undeclared or value is None:
+                        self.check_variable(pc - 2, value)
+                    push(value)
+                elif opcode == OP_PRINT:
+                    output(pop(), "\n" if argument else "")
+                    self.prev_print_has_newline = argument == 1
+                elif opcode == OP_POP:
+                    pop()
+                elif opcode == OP_DECLARE:
+                    if values[argument] is not undeclared:
+                        raise self.error(InterpreterError.DUPLICATE_VARIABLE, self.bytecode.sites[pc - 2])
+                    values[argument] = pop()
+                elif opcode == OP_STORE:
+                    if values[argument] is undeclared:
+                        raise self.error(InterpreterError.VARIABLE_NOT_DECLARED, self.bytecode.sites[pc - 2])
+                    values[argument] = pop()
+                elif opcode == OP_INPUT:
+                    self.input_slot(argument, slot_types, self.bytecode.sites[pc - 2])
+                elif opcode == OP_INCOMPATIBLE:
+                    if values[argument] is undeclared:
+                        raise self.error(InterpreterError.VARIABLE_NOT_DECLARED, self.bytecode.sites[pc - 2])
+                    raise self.error(InterpreterError.INCOMPATIBLE_DATA_TYPE, self.bytecode.sites[pc - 2])
+                elif opcode == OP_DECLARE_INCOMPATIBLE:
+                    if values[argument] is not undeclared:
+                        raise self.error(InterpreterError.DUPLICATE_VARIABLE, self.bytecode.sites[pc - 2])
+                    raise self.error(InterpreterError.INCOMPATIBLE_DATA_TYPE, self.bytecode.sites[pc - 2])
+                else:
+                    raise self.error(constants[argument], self.bytecode.sites[pc - 2])
+        except ArithmeticError:
+            raise self.error(InterpreterError.INVALID_ARITHMETIC_OPERATION, self.bytecode.sites[pc - 2])
+
+    # Raises an error if the arithmetic instruction would exceed one of the execution limits of the run
+    def check_limits(self, opcode, argument, stack, pc):
+        count = argument if opcode == OP_MEAN else 4 if opcode == OP_DIST else 2
+
+        if self.exceeds_limits(opcode_operators[opcode], stack[len(stack) - count:]):
+            raise self.error(InterpreterError.LIMIT_EXCEEDED, self.bytecode.sites[pc])
+
+    # Raises the error of reading a variable that is not declared or has no value yet
+    def check_variable(self, pc, value):
+        if value is undeclared:
+            raise self.error(InterpreterError.VARIABLE_NOT_DECLARED, self.bytecode.sites[pc])
+        raise self.error(InterpreterError.INVALID_EXPRESSION, self.bytecode.sites[pc])
+
+    # Reads the value of an INPUT statement and stores it to the variable at the slot
+    def input_slot(self, slot, slot_types, sites):
+        input_value = self.read_value()
+
+        typ, number = Lexer.get_number(input_value)
+        # A floating-point value
+        if typ == 1:
+            raise self.error(InterpreterError.INVALID_DATA_TYPE_INPUT, sites[0])
+        # An integer; it is kept as int if it is displayed the same way, so it is not converted once read
+        elif typ == 0:
+            input_type = TokenType.NUMBER
+            if str(number) == input_value:
+                input_value = number
+        # A string
+        else:
+            input_type = TokenType.STRING
+
+            if not Lexer.is_printable_ascii_string(input_value):
+                raise self.error(InterpreterError.INVALID_SYNTAX, sites[0])
+
+        if slot == -1:
+            return
+        if self.values[slot] is undeclared:
+            raise self.error(InterpreterError.VARIABLE_NOT_DECLARED, sites[1])
+        if input_type is not slot_types[slot]:
+            raise self.error(InterpreterError.INCOMPATIBLE_DATA_TYPE, sites[1])
+
+        self.values[slot] = input_value
+
+
+# TranspiledProgram class that holds the Python function translated from a parsed program
+class TranspiledProgram:
+    def __init__(self, _program, _code, _names, _slot_types, _errors):
+        self.program = _program
+        self.code = _code                   # Compiled Python code of the function
+        self.names = _names                 # Contains the variable name of each slot
+        self.slot_types = _slot_types       # Contains the data type of each slot, None if never declared
+        self.errors = _errors               # Contains the error message, site and previous PRINT newline flag
+                                            #   of each point where the function can raise an error
+
+        namespace = {"undeclared": undeclared, "TokenType": TokenType}
+        exec(_code, namespace)
+        self.function = namespace["run"]
+
+
+# Transpiler class that translates a parsed program into the source of an equivalent Python function
+# Since the statements are always executed in order, the state of each variable (declared, with value) is known at
+#   every statement, so only arithmetic operations and INPUT statements need to be checked when the function runs
+# Variables are held in local variables v<slot> and intermediate results in t<index>
+class Transpiler:
+    def __init__(self, _program):
+        self.program = _program
+        self.lines = []
+        self.errors = []
+        self.slots = {}
+        self.names = []
+        self.slot_types = []
+        self.declared = []                  # Flags that the variable of the slot is declared
+        self.assigned = []                  # Flags that the variable of the slot has a value
+        self.integer = []                   # Flags that the variable of the slot holds an int
+        self.temp_count = 0
+        self.prev_print_has_newline = True
+        self.reachable = True               # Flags that the next statement can be reached
+
+    # Translates all the statements of the program
+    def transpile(self):
+        for statement in self.program.statements:
+            if type(statement) is Declaration and statement.name not in self.slots:
+                self.get_slot(statement.name, statement.type)
+
+        for statement in self.program.statements:
+            if not self.reachable:
+                break
+
+            if type(statement) is Output:
+                value = self.transpile_expression(statement.expression)[0]
+                self.add_line("output(%s, %r)" % (value, statement.end))
+                self.prev_print_has_newline = statement.end == "\n"
+
+            elif type(statement) is Declaration:
+                value, typ, integer = "None", statement.type, False
+                if statement.expression is not None:
+                    value, typ, integer = self.transpile_expression(statement.expression)
+                slot = self.get_slot(statement.name)
+
+                if self.declared[slot]:
+                    self.add_fail(InterpreterError.DUPLICATE_VARIABLE, statement.site)
+                elif typ is not statement.type:
+                    self.add_fail(InterpreterError.INCOMPATIBLE_DATA_TYPE, statement.site)
+                else:
+                    self.add_assignment(slot, value, integer)
+                    self.declared[slot] = True
+                    self.assigned[slot] = statement.expression is not None
+
+            elif type(statement) is Assignment:
+                value, typ, integer = self.transpile_expression(statement.expression)
+                slot = self.get_slot(statement.name)
+
+                if not self.declared[slot]:
+                    self.add_fail(InterpreterError.VARIABLE_NOT_DECLARED, statement.site)
+                elif typ is not self.slot_types[slot]:
+                    self.add_fail(InterpreterError.INCOMPATIBLE_DATA_TYPE, statement.site)
+                else:
+                    self.add_assignment(slot, value, integer)
+                    self.assigned[slot] = True
+
+            elif type(statement) is Input:
+                read_error = self.add_error(InterpreterError.INVALID_DATA_TYPE_INPUT, statement.site)
+
+                if statement.assign_site is None:
+                    self.add_line("read_input(%d)" % read_error)
+                    continue
+
+                slot = self.get_slot(statement.name)
+                if not self.declared[slot]:
+                    self.add_line("read_input(%d)" % read_error)
+                    self.add_fail(InterpreterError.VARIABLE_NOT_DECLARED, statement.assign_site)
+                else:
+                    assign_error = self.add_error(InterpreterError.INCOMPATIBLE_DATA_TYPE, statement.assign_site)
+                    self.add_line("v%d = read_input(%d, %d, %d)" % (slot, read_error, assign_error, slot))
+                    self.assigned[slot] = True
+                    self.integer[slot] = False
+
+            elif type(statement) is Evaluation:
+                self.transpile_expression(statement.expression)
+
+            else:
+                self.transpile_expression(statement)
+
+            self.temp_count = 0
+
+        names = ["v%d" % slot for slot in range(len(self.names))]
+        header = ["def run(interpreter, values):",
+                  "    fail = interpreter.raise_error",
+                  "    read_input = interpreter.read_input",
+                  "    output = interpreter.output.print",
+                  "    check = interpreter.check_operation",
+                  "    limited = interpreter.limits is not None",
+                  "    site = 0",
+                  "    " + " = ".join(names + ["undeclared"]),
+                  "    try:"]
+        footer = ["        pass",
+                  "    except ArithmeticError:",
+                  "        fail(site)",
+                  "    finally:",
+                  "        values[:] = (%s)" % "".join(name + ", " for name in names)]
+
+        source = "\n".join(header + self.lines + footer) + "\n"
+        code = compile(source, "<interpol>", "exec")
+        return TranspiledProgram(self.program, code, self.names, self.slot_types, self.errors)
+
+    # Translates the expression
+    # Returns the Python expression of its value, the data type of the value and if it is an int
+    # Operands of arithmetic operations are translated to int expressions
+    def transpile_expression(self, node, operand=False):
+        if type(node) is Arithmetic:
+            return run_nested(self.transpile_operation(node))
+        return self.transpile_value(node, operand)
+
+    # Translates a literal value, a variable or the error of an incomplete expression
+    def transpile_value(self, node, operand):
+        if type(node) is Literal:
+            if node.value.type is TokenType.STRING:
+                if not operand:
+                    return repr(node.value.value), TokenType.STRING, False
+                self.add_fail(InterpreterError.INCOMPATIBLE_DATA_TYPE, node.site)
+                return "None", TokenType.NUMBER, True
+
+            number = node.value.number
+            # Numbers are kept as lexeme if the int is not printed the same way; folded numbers are already int
+            if not operand and type(node.value.value) is str and str(number) != node.value.value:
+                return repr(node.value.value), TokenType.NUMBER, False
+            return "(%d)" % number, TokenType.NUMBER, True
+
+        if type(node) is Identifier:
+            slot = self.get_slot(node.name)
+
+            if not self.declared[slot]:
+                self.add_fail(InterpreterError.VARIABLE_NOT_DECLARED, node.site)
+            elif node.checked and self.slot_types[slot] is TokenType.STRING:
+                self.add_fail(InterpreterError.INCOMPATIBLE_DATA_TYPE, node.site)
+            elif not self.assigned[slot]:
+                self.add_fail(InterpreterError.INVALID_EXPRESSION, node.site)
+
+            if operand and not self.integer[slot]:
+                return "int(v%d)" % slot, TokenType.NUMBER, True
+            return "v%d" % slot, self.slot_types[slot], self.integer[slot]
+
+        self.add_fail(node.message, node.site)
+        return "None", None, False
+
+    # Translates the operation; a generator run by run_nested, which yields the generator of each nested operation
+    #   and receives its translation
+    def transpile_operation(self, node):
+        operands = []
+
+        for operand_node in node.operands:
+            if type(operand_node) is Arithmetic:
+                operands.append((yield self.transpile_operation(operand_node))[0])
+            else:
+                operands.append(self.transpile_value(operand_node, True)[0])
+
+        if not self.reachable:
+            return "None", TokenType.NUMBER, True
+
+        limit_error = self.add_error(InterpreterError.LIMIT_EXCEEDED, node.site)
+        self.add_line("if limited: check(%d, TokenType.%s, [%s])" % (limit_error, node.operator.name,
+                                                                     ", ".join(operands)))
+
+        if node.operator is TokenType.BASIC_OPERATOR_ADD:
+            value = "%s + %s" % tuple(operands)
+        elif node.operator is TokenType.BASIC_OPERATOR_SUB:
+            value = "%s - %s" % tuple(operands)
+        elif node.operator is TokenType.BASIC_OPERATOR_MUL:
+            value = "%s * %s" % tuple(operands)
+        else:
+            self.add_line("site = %d" % self.add_error(InterpreterError.INVALID_ARITHMETIC_OPERATION, node.site))
+
+            if node.operator is TokenType.BASIC_OPERATOR_DIV:
+                value = "int(%s / %s)" % tuple(operands)
+            elif node.operator is TokenType.BASIC_OPERATOR_MOD:
+                value = "int(%s %% %s)" % tuple(operands)
+            elif node.operator is TokenType.ADVANCED_OPERATOR_EXP:
+                value = "int(%s ** %s)" % tuple(operands)
+            elif node.operator is TokenType.ADVANCED_OPERATOR_ROOT:
+                value = "int(%s ** (1/float(%s)))" % (operands[1], operands[0])
+            elif node.operator is TokenType.ADVANCED_OPERATOR_AVE:
+                # The operands are summed by sum(), since a long chain of + is too deep for the Python compiler
+                value = "int(sum([%s])/%d)" % (", ".join(operands), len(operands))
+            else:
+                value = "int(((({3}-{1})**2)+(({2}-{0})**2))**(1/2))".format(*operands)
+
+        temp = "t%d" % self.temp_count
+        self.temp_count += 1
+        self.add_line("%s = %s" % (temp, value))
+
+        return temp, TokenType.NUMBER, True
+
+    # Adds the assignment of a value to the variable at the slot
+    def add_assignment(self, slot, value, integer):
+        self.add_line("v%d = %s" % (slot, value))
+        self.integer[slot] = integer
+
+    # Adds a line of the function body
+    def add_line(self, line):
+        if self.reachable:
+            self.lines.append("        " + line)
+
+    # Adds an error that is always raised once reached; the statements after it cannot be reached
+    def add_fail(self, message, site):
+        self.add_line("fail(%d)" % self.add_error(message, site))
+        self.reachable = False
+
+    # Returns the index of a new error point
+    def add_error(self, message, site):
+        self.errors.append((message, site, self.prev_print_has_newline))
+        return len(self.errors) - 1
+
+    # Returns the slot of the variable, adding it to the slots if it is new
+    def get_slot(self, name, typ=None):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+            self.slot_types.append(typ)
+            self.declared.append(False)
+            self.assigned.append(False)
+            self.integer.append(False)
+        return self.slots[name]
+
+
+# PythonInterpreter class that runs the Python function translated from a parsed program
+class PythonInterpreter(Interpreter):
+    def __init__(self, _transpiled, _output=None, _inputs=None, _limits=None):
+        super().__init__(_transpiled.program, _output, _inputs, _limits)
+        self.transpiled = _transpiled
+        self.values = []
+
+    # Runs the translated function, then fills the variables dictionary for the symbols table
+    def execute(self):
+        try:
+            self.transpiled.function(self, self.values)
+        except InterpreterError as e:
+            self.show_error(e)
+        finally:
+            self.output.flush()
+
+        self.set_slot_variables(self.transpiled.names, self.transpiled.slot_types, self.values)
+
+    # Raises the error at the given error point
+    def raise_error(self, index):
+        message, site, self.prev_print_has_newline = self.transpiled.errors[index]
+        raise self.error(message, site)
+
+    # Raises the error at the given error point if the operation would exceed one of the execution limits
+    def check_operation(self, index, operator, operands):
+        if self.exceeds_limits(operator, operands):
+            self.raise_error(index)
+
+    # Reads the value of an INPUT statement; assign_error is the error point if the value has the wrong data type
+    #   for the variable at the slot
+    def read_input(self, read_error, assign_error=None, slot=None):
+        input_value = self.read_value()
+
+        typ, number = Lexer.get_number(input_value)
+        # A floating-point value
+        if typ == 1:
+            self.raise_error(read_error)
+        # An integer; it is kept as int if it is displayed the same way, so it is not converted once read
+        elif typ == 0:
+            input_type = TokenType.NUMBER
+            if str(number) == input_value:
+                input_value = number
+        # A string
+        else:
+            input_type = TokenType.STRING
+
+            if not Lexer.is_printable_ascii_string(input_value):
+                message, site, self.prev_print_has_newline = self.transpiled.errors[read_error]
+                raise self.error(InterpreterError.INVALID_SYNTAX, site)
+
+        if slot is not None and input_type is not self.transpiled.slot_types[slot]:
+            self.raise_error(assign_error)
+
+        return input_value
+
+
+# VectorValue class that holds the values of an expression in all the rows run by the VectorEngine
+# The values are either a single value shared by all the rows, or a list or array with the value of each row
+class VectorValue:
+    __slots__ = ("type", "values", "numbers")
+
+    def __init__(self, _type, _values, _numbers=None):
+        self.type = _type
+        self.values = _values
+        self.numbers = _numbers             # Contains the int values of a NUMBER value
+
+
+# VectorFallback exception class raised by the VectorEngine when all the rows raise the same error, such as using a
+#   variable that is not declared; all the rows are then run by the Interpreter
+class VectorFallback(Exception):
+    pass
+
+
+# VectorEngine class that runs a parsed program for many rows of INPUT values at once
+# Since programs have no branches nor loops, each statement is evaluated once for all the rows as an operation on
+#   columns of values, which are NumPy int64 arrays if NumPy is installed and the values fit, and Python ints
+#   otherwise so that the values are always exact
+# Only the rows that run without errors are computed this way: a row is flagged as soon as one of its values would
+#   raise an error, then the flagged rows are run one at a time by the Interpreter, which raises the error exactly as
+#   when the row is run alone
+class VectorEngine:
+    int64_limit = 1 << 63               # Values of int64 operations must be smaller than this
+    float_limit = 1 << 53               # Ints up to this size are converted to float without rounding
+
+    def __init__(self, _program, _rows):
+        self.program = _program
+        self.rows = _rows
+        self.size = len(_rows)
+        self.flagged = [False] * self.size  # Flags the rows that raise an error
+        self.variables = {}                 # Contains the data type and VectorValue of each declared variable
+        self.outputs = []                   # Contains the printed texts and end of each PRINT statement
+        self.input_count = 0                # Contains the number of INPUT statements executed
+
+    # Runs the program for all the rows; returns the result of each row
+    def run(self):
+        try:
+            for statement in self.program.statements:
+                if type(statement) is Output:
+                    self.outputs.append((self.get_texts(self.evaluate(statement.expression)), statement.end))
+                elif type(statement) is Declaration:
+                    self.assign(statement)
+                elif type(statement) is Assignment:
+                    self.store(statement)
+                elif type(statement) is Input:
+                    self.input(statement)
+                elif type(statement) is Evaluation:
+                    self.evaluate(statement.expression)
+                else:
+                    raise VectorFallback
+
+        except VectorFallback:
+            self.flagged = [True] * self.size
+
+        symbols = []
+        for name, (typ, value) in self.variables.items():
+            symbols.append((name, "INTEGER" if typ is TokenType.NUMBER else "STRING",
+                            "" if value is None else self.get_texts(value)))
+
+        return [self.get_result(index, symbols) for index in range(self.size)]
+
+    # Returns the result of a row, which is run by the Interpreter if it is flagged
+    def get_result(self, index, symbols):
+        if self.flagged[index]:
+            return run_compiled(self.program, "ast", ListInput(self.rows[index]))
+
+        result = get_empty_result()
+        result["output"] = "".join((texts if type(texts) is str else texts[index]) + end
+                                   for texts, end in self.outputs)
+        result["symbols"] = [[name, typ, texts if type(texts) is str else texts[index]]
+                             for name, typ, texts in symbols]
+        return result
+
+    # Evaluates the expression for all the rows
+    def evaluate(self, node):
+        if type(node) is Arithmetic:
+            return run_nested(self.evaluate_operation(node))
+
+        if type(node) is Literal:
+            return VectorValue(node.value.type, node.value.value, node.value.number)
+
+        if type(node) is Identifier:
+            variable = self.variables.get(node.name)
+
+            # Variables have the same data type in all the rows, so these are errors in all the rows
+            if variable is None or node.checked and variable[0] is not TokenType.NUMBER or variable[1] is None:
+                raise VectorFallback
+
+            return variable[1]
+
+        raise VectorFallback
+
+    # Evaluates the operation for all the rows; a generator run by run_nested, which yields the generator of each
+    #   nested operation and receives its values
+    def evaluate_operation(self, node):
+        operands = []
+
+        for operand in node.operands:
+            if type(operand) is Arithmetic:
+                value = yield self.evaluate_operation(operand)
+            else:
+                value = self.evaluate(operand)
+
+            if value.type is not TokenType.NUMBER:
+                raise VectorFallback
+
+            operands.append(value.numbers)
+
+        numbers = self.arithmetic(node.operator, operands)
+        return VectorValue(TokenType.NUMBER, numbers, numbers)
+
+    # Executes the VARINT and VARSTR statements
+    def assign(self, statement):
+        value = None
+
+        if statement.expression is not None:
+            value = self.evaluate(statement.expression)
+
+        if statement.name in self.variables or value is not None and value.type is not statement.type:
+            raise VectorFallback
+
+        self.variables[statement.name] = [statement.type, value]
+
+    # Executes the STORE statement
+    def store(self, statement):
+        value = self.evaluate(statement.expression)
+        variable = self.variables.get(statement.name)
+
+        if variable is None or value.type is not variable[0]:
+            raise VectorFallback
+
+        variable[1] = value
+
+    # Executes the INPUT statement; the value of each row is the next value of the row
+    def input(self, statement):
+        variable = self.variables.get(statement.name)
+
+        if statement.assign_site is None or variable is None:
+            raise VectorFallback
+
+        position = self.input_count
+        self.input_count += 1
+        values = []
+        numbers = []
+
+        for index, row in enumerate(self.rows):
+            value = None
+            number = 0
+
+            if not self.flagged[index] and position < len(row):
+                value = row[position]
+                typ, number = Lexer.get_number(value)
+
+                # A floating-point value, a string with invalid characters or a value of the wrong data type
+                if typ == 1 or typ == 2 and not Lexer.is_printable_ascii_string(value) or \
+                        (TokenType.NUMBER if typ == 0 else TokenType.STRING) is not variable[0]:
+                    value = None
+
+            if value is None:
+                self.flagged[index] = True
+                number = 0
+            values.append(value)
+            numbers.append(number)
+
+        if variable[0] is TokenType.NUMBER:
+            variable[1] = VectorValue(variable[0], values, self.pack(numbers))
+        else:
+            variable[1] = VectorValue(variable[0], values)
+
+    # Returns the printed text of a value, or the list of the printed text of each row
+    @staticmethod
+    def get_texts(value):
+        values = value.values
+
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            values = values.tolist()
+        if type(values) is list:
+            return [str(item) for item in values]
+
+        return str(values)
+
+    # Returns the column of a list of ints; an int64 array if possible
+    @staticmethod
+    def pack(numbers):
+        if numpy is None:
+            return numbers
+
+        try:
+            return numpy.array(numbers, dtype=numpy.int64)
+        except OverflowError:
+            return numpy.array(numbers, dtype=object)
+
+    # Computes the arithmetic operation of the operands for all the rows
+    def arithmetic(self, operator, operands):
+        columns = [operand for operand in operands if type(operand) is not int]
+
+        # Operands with the same value in all the rows give the same value or error in all the rows
+        if not columns:
+            try:
+                return Interpreter.arithmetic(operator, operands).value
+            except Exception:
+                raise VectorFallback
+
+        if numpy is not None:
+            numbers = self.compute_int64(operator, operands)
+
+            if numbers is not None:
+                return numbers
+
+        return self.compute_exact(operator, operands)
+
+    # Computes the operation of each row with Python ints, exactly as the Interpreter does
+    def compute_exact(self, operator, operands):
+        columns = []
+
+        for operand in operands:
+            if type(operand) is int:
+                columns.append([operand] * self.size)
+            elif type(operand) is list:
+                columns.append(operand)
+            else:
+                columns.append(operand.tolist())
+
+        numbers = []
+
+        for index, values in enumerate(zip(*columns)):
+            number = 0
+
+            if not self.flagged[index]:
+                try:
+                    number = Interpreter.arithmetic(operator, values).value
+                except Exception:
+                    self.flagged[index] = True
+
+            numbers.append(number)
+
+        return self.pack(numbers)
+
+    # Computes the operation of all the rows as an int64 array operation; returns None if the operation cannot be
+    #   computed exactly this way
+    # Divisions are computed in float64 like int(a / b) only if the operands can be converted to float exactly
+    def compute_int64(self, operator, operands):
+        bounds = []
+
+        for operand in operands:
+            if type(operand) is int:
+                bounds.append(abs(operand))
+            elif operand.dtype == numpy.int64:
+                bounds.append(max(-int(operand.min()), int(operand.max())))
+            else:
+                return None
+
+        if max(bounds) >= self.int64_limit:
+            return None
+
+        if operator is TokenType.ADVANCED_OPERATOR_AVE:
+            if sum(bounds) > self.float_limit:
+                return None
+            total = numpy.zeros(self.size, dtype=numpy.int64)
+            for operand in operands:
+                total = total + operand
+            return numpy.trunc(total / len(operands)).astype(numpy.int64)
+
+        if len(operands) != 2:
+            return None
+
+        operand1, operand2 = operands
+        bound1, bound2 = bounds
+
+        if operator is TokenType.BASIC_OPERATOR_ADD and bound1 + bound2 < self.int64_limit:
+            return numpy.add(operand1, operand2)
+        if operator is TokenType.BASIC_OPERATOR_SUB and bound1 + bound2 < self.int64_limit:
+            return numpy.subtract(operand1, operand2)
+        if operator is TokenType.BASIC_OPERATOR_MUL and bound1 * bound2 < self.int64_limit:
+            return numpy.multiply(operand1, operand2)
+
+        if operator is TokenType.BASIC_OPERATOR_DIV and bound1 <= self.float_limit and bound2 <= self.float_limit:
+            divisor = self.flag_zero(operand2)
+            return numpy.trunc(numpy.true_divide(operand1, divisor)).astype(numpy.int64)
+        if operator is TokenType.BASIC_OPERATOR_MOD:
+            divisor = self.flag_zero(operand2)
+            return numpy.remainder(operand1, divisor).astype(numpy.int64)
+
+        if operator is TokenType.ADVANCED_OPERATOR_EXP and numpy.all(numpy.greater_equal(operand2, 0)) and \
+                bound1.bit_length() * bound2 < 63:
+            return numpy.power(operand1, operand2).astype(numpy.int64)
+
+        # ROOT and DIST are computed with the float operations of Python
+        return None
+
+    # Flags the rows where the divisor is zero; returns the divisor with 1 in the flagged rows
+    def flag_zero(self, divisor):
+        zero = numpy.broadcast_to(numpy.equal(divisor, 0), (self.size,))
+
+        for index in numpy.flatnonzero(zero).tolist():
+            self.flagged[index] = True
+
+        return numpy.where(zero, 1, divisor)
+
+
+# LineProfile class that holds the profile of a line of the source code: the number of times its statement was
+#   executed, the time spent on each phase and the number of times and time of each arithmetic operator
+class LineProfile:
+    def __init__(self, _line_no):
+        self.line_no = _line_no
+        self.count = 0
+        self.times = dict.fromkeys(Profiler.phases, 0.0)
+        self.operators = {}                 # Contains the count and time of each operator keyword
+
+    # Returns the time spent on all the phases
+    def get_total(self): return sum(self.times.values())
+
+
+# Profiler class that keeps the profile of each line of the source code while the program is parsed and executed
+# The phases are lexing the tokens, parsing them, computing arithmetic operations, reading and writing values
+#   (io), and the rest of the execution of the statements, such as reading variables
+class Profiler:
+    phases = ["lexing", "parsing", "arithmetic", "io", "execution"]
+
+    def __init__(self):
+        self.lines = {}
+
+    # Returns the profile of a line, adding it if it is new
+    def get_line(self, line_no):
+        profile = self.lines.get(line_no)
+
+        if profile is None:
+            profile = self.lines[line_no] = LineProfile(line_no)
+
+        return profile
+
+    # Adds the time spent on a phase of a line
+    def add(self, line_no, phase, elapsed):
+        self.get_line(line_no).times[phase] += elapsed
+
+    # Adds the time spent on an arithmetic operation of a line
+    def add_operator(self, line_no, operator, elapsed):
+        profile = self.get_line(line_no)
+        profile.times["arithmetic"] += elapsed
+
+        counts = profile.operators.setdefault(operator_keywords[operator], [0, 0.0])
+        counts[0] += 1
+        counts[1] += elapsed
+
+    # Returns the profiles of the lines, the slowest first
+    def get_profiles(self):
+        return sorted(self.lines.values(), key=lambda profile: (-profile.get_total(), profile.line_no))
+
+    # Returns the profile of all the lines together
+    def get_total_profile(self):
+        total = LineProfile("TOTAL")
+
+        for profile in self.lines.values():
+            total.count += profile.count
+
+            for phase, elapsed in profile.times.items():
+                total.times[phase] += elapsed
+            for keyword, (count, elapsed) in profile.operators.items():
+                counts = total.operators.setdefault(keyword, [0, 0.0])
+                counts[0] += count
+                counts[1] += elapsed
+
+        return total
+
+    # Returns the profile as a dictionary that can be written as JSON, with the source code of each line; times
+    #   are in seconds
+    def to_dict(self, code):
+        lines = bytes(code).split(b"\n")
+        profiles = []
+
+        for profile in self.get_profiles() + [self.get_total_profile()]:
+            source = b""
+            if type(profile.line_no) is int and profile.line_no <= len(lines):
+                source = lines[profile.line_no - 1]
+
+            profiles.append({"line": profile.line_no, "source": source.decode("utf-8", "replace"),
+                             "count": profile.count, "time": profile.get_total(), "phases": profile.times,
+                             "operators": {keyword: {"count": count, "time": elapsed}
+                                           for keyword, (count, elapsed) in profile.operators.items()}})
+
+        return {"lines": profiles[:-1], "total": profiles[-1]}
+
+
+# Keyword of each arithmetic operator
+operator_keywords = {typ: keyword for keyword, typ in keyword_token_types.items()}
+
+
+# Returns a row of the PROFILE table; times are in milliseconds
+def get_profile_row(profile):
+    row = str(profile.line_no).ljust(10) + str(profile.count).ljust(7)
+    row += "".join(("%.3f" % (elapsed * 1000)).rjust(12) for elapsed in [profile.get_total()] +
+                   [profile.times[phase] for phase in Profiler.phases])
+
+    # The operators that took the most time first, with their time and count
+    ranked = sorted(profile.operators.items(), key=lambda item: -item[1][1])
+    return (row + "  " + ", ".join("%s %.3f (%d)" % (keyword, elapsed * 1000, count)
+                                   for keyword, (count, elapsed) in ranked)).rstrip()
+
+
+# ProfilingLexer class that adds the time spent on lexing and parsing each line to a Profiler
+# The parser asks for the tokens one at a time, so the time between two tokens is spent on parsing the line of the
+#   previous token
+class ProfilingLexer(Lexer):
+    def __init__(self, _code, _profiler):
+        super().__init__(_code)
+        self.profiler = _profiler
+        self.prev_line_no = None            # Contains the line number of the previous token
+        self.prev_end = None                # Contains the time when the previous token was returned
+
+    def next_token(self):
+        start = time.perf_counter()
+        line_no = self.line_no
+
+        if self.prev_line_no is not None:
+            self.profiler.add(self.prev_line_no, "parsing", start - self.prev_end)
+
+        try:
+            token = super().next_token()
+        finally:
+            self.prev_end = time.perf_counter()
+            self.profiler.add(line_no, "lexing", self.prev_end - start)
+
+        self.prev_line_no = token.line_no
+        return token
+
+
+# ProfilingInterpreter class that adds the time spent on executing each statement to a Profiler
+# The time of the arithmetic operations and the time of reading and writing values are kept apart from the rest
+#   of the execution of the statement
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, _program, _profiler, _output=None, _inputs=None, _limits=None):
+        super().__init__(_program, _output, _inputs, _limits)
+        self.profiler = _profiler
+        self.line_no = None                 # Contains the line number of the statement being executed
+        self.nested_time = 0.0              # Contains the time of the arithmetic and io of the statement
+
+    def execute_statement(self, statement):
+        self.line_no = self.get_line_no(statement)
+        self.nested_time = 0.0
+        start = time.perf_counter()
+
+        try:
+            super().execute_statement(statement)
+        finally:
+            profile = self.profiler.get_line(self.line_no)
+            profile.count += 1
+            profile.times["execution"] += time.perf_counter() - start - self.nested_time
+
+    # Computes the arithmetic operation of the operands, adding its time to the profile of the line
+    def arithmetic(self, operator, operands):
+        start = time.perf_counter()
+
+        try:
+            return Interpreter.arithmetic(operator, operands)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.nested_time += elapsed
+            self.profiler.add_operator(self.line_no, operator, elapsed)
+
+    # Executes the PRINT and PRINTLN statements, adding the time of writing the value to the profile of the line
+    def print(self, statement):
+        value = self.evaluate_expression(statement.expression)
+        start = time.perf_counter()
+
+        self.output.print(value.value, statement.end)
+
+        self.prev_print_has_newline = statement.end == "\n"
+        self.add_io(start)
+
+    # Reads the value of an INPUT statement, adding its time to the profile of the line
+    def read_value(self):
+        start = time.perf_counter()
+
+        try:
+            return super().read_value()
+        finally:
+            self.add_io(start)
+
+    # Adds the time since start to the io of the line
+    def add_io(self, start):
+        elapsed = time.perf_counter() - start
+        self.nested_time += elapsed
+        self.profiler.add(self.line_no, "io", elapsed)
+
+    # Returns the line number of a statement
+    @staticmethod
+    def get_line_no(statement):
+        if type(statement) is Output or type(statement) is Evaluation:
+            return statement.expression.site[0]
+        return statement.site[0]
+
+
+# ReplInterpreter class that executes the statements of a REPL session, one statement at a time
+# The statements are parsed on their own, so their sites are relative to their lines; the line number of the session
+#   where the statement starts is added to the line number of the errors
+class ReplInterpreter(Interpreter):
+    def __init__(self, _output=None, _inputs=None, _limits=None):
+        super().__init__(Program(b"", []), _output, _inputs, _limits)
+        self.line_no = 1                    # Contains the line number of the session where the statement starts
+
+    # Executes the statements parsed from the lines that start at the given line number of the session
+    def execute_lines(self, analysis, statements, line_no):
+        self.program = Program(analysis.code, None)
+        self.line_no = line_no
+        self.operation_count = 0
+
+        # Each statement is a run of its own for the limits
+        if self.limits is not None and self.limits.timeout is not None:
+            self.deadline = time.monotonic() + self.limits.timeout
+
+        try:
+            for statement in statements:
+                self.execute_statement(statement)
+        except InterpreterError as e:
+            self.show_error(e)
+            self.output.write("\n")
+            self.prev_print_has_newline = True
+        finally:
+            self.output.flush()
+
+    # Returns the error to be raised at the given site, at the line number of the session
+    def error(self, message, site):
+        self.token_count = site[3]
+        return InterpreterError(message, self.line_no + site[0] - 1, self.program.get_line(site))
+
+
+# ReplSession class that runs an INTERPOL program one line at a time as the lines are entered, keeping the variables
+#   of a single ReplInterpreter between the lines, so that the lines already entered are never run again
+# Each line is parsed on its own like the IncrementalAnalyzer does, and the parsed lines are kept by their text so
+#   that a line entered again is not parsed again
+# Unlike a whole file, an error does not stop the session: it is displayed, and the next line can be entered
+class ReplSession:
+    prompt = "ipol> "
+    continuation_prompt = "....> "
+
+    def __init__(self, _output=None, _inputs=None, _limits=None):
+        self.interpreter = ReplInterpreter(_output, _inputs, _limits)
+        self.line_no = 1                    # Contains the line number of the next line entered
+        self.has_begin = False              # Flags that there is already a BEGIN statement
+        self.has_end = False                # Flags that END ended the session
+        self.analyses = {}                  # Contains the analysis of each parsed code
+        self.last_lines = None              # Contains the analysis and line number of the last lines with tokens;
+                                            #   used for Invalid end of file
+
+    # Reads the lines of the session with the given function until END, or until there are no more lines
+    def run(self, read_line):
+        while not self.has_end:
+            self.interpreter.output.flush()
+
+            try:
+                lines = [read_line(self.prompt)]
+            except EOFError:
+                # There are no more lines but END was not entered
+                if self.last_lines is not None:
+                    analysis, line_no = self.last_lines
+                    self.interpreter.execute_lines(analysis, [Fail(InterpreterError.INVALID_EOF, analysis.last_site)],
+                                                   line_no)
+                break
+
+            analysis = self.parse(lines, False)
+
+            # An operation that is still incomplete after a MEAN that ends the line goes on in the next line
+            while analysis.reads_next_line:
+                try:
+                    lines.append(read_line(self.continuation_prompt))
+                except EOFError:
+                    analysis = self.parse(lines, True)
+                    break
+
+                analysis = self.parse(lines, False)
+
+            self.execute(analysis)
+
+    # Returns the analysis of the entered lines; the last line has no new line if there are no more lines
+    def parse(self, lines, last):
+        code = get_source_bytes("\n".join(lines) + ("" if last else "\n"))
+        analysis = self.analyses.get(code)
+
+        if analysis is None:
+            analysis = self.analyses[code] = LineAnalysis(code, len(lines))
+
+        return analysis
+
+    # Executes the statement of the entered lines
+    def execute(self, analysis):
+        line_no = self.line_no
+        self.line_no += analysis.line_count
+
+        if analysis.last_site is not None:
+            self.last_lines = analysis, line_no
+
+        # The syntax error of the lines is raised after their statement is executed, as when a whole file is run
+        statements = [statement for statement in (analysis.statement, analysis.failure) if statement is not None]
+
+        # Make sure the first statement is BEGIN, as when a whole file is parsed
+        if not self.has_begin and analysis.first_type is not None and \
+                analysis.first_type is not TokenType.PROGRAM_BEGIN:
+            statements = [Fail(InterpreterError.INVALID_SYNTAX, analysis.first_site)]
+        elif analysis.first_type is TokenType.PROGRAM_BEGIN and analysis.failure is None:
+            self.has_begin = True
+        elif analysis.first_type is TokenType.PROGRAM_END and analysis.failure is None:
+            self.has_end = True
+
+        self.interpreter.execute_lines(analysis, statements, line_no)
+
+
+# DataflowInterpreter class that executes a program while the RAISE and ROOT computations of its statements that
+#   do not depend on each other are computed at the same time by a pool of worker processes
+# Statements only depend on each other through the variables: a statement can be computed once the last statement
+#   before it that writes each variable it reads is executed, which is found for all the statements before the run
+# The statements are still executed in the order of the program: the computed value of a statement is only used
+#   once it is reached, so the output and the errors are the same as those of the Interpreter
+class DataflowInterpreter(Interpreter):
+    def __init__(self, _program, _output=None, _inputs=None, _workers=None):
+        super().__init__(_program, _output, _inputs)
+        self.workers = _workers
+        self.pool = None                    # Contains the pool of worker processes, created once it is needed
+        self.results = {}                   # Contains the pending computed value of each dispatched statement
+        self.index = -1                     # Contains the index of the statement being executed
+        self.ready = self.get_ready_statements()
+
+    # Returns the statements to be dispatched to the worker processes, with the variables they read, by the index
+    #   of the statement that has to be executed before each of them
+    # Only the statements with a RAISE or ROOT operation are dispatched, since these are the expensive ones
+    def get_ready_statements(self):
+        ready = {}
+        writers = {}                        # Contains the index of the last statement that writes each variable
+
+        for index, statement in enumerate(self.program.statements):
+            if type(statement) in (Output, Declaration, Assignment, Evaluation) and \
+                    type(statement.expression) is Arithmetic:
+                names, dispatched = get_dataflow_reads(statement.expression)
+
+                if dispatched:
+                    after = max((writers.get(name, -1) for name in names), default=-1)
+                    # The statement right after is computed when it is executed instead
+                    if after < index - 1:
+                        ready.setdefault(after, []).append((index, names))
+
+            if type(statement) in (Declaration, Assignment) or \
+                    type(statement) is Input and statement.assign_site is not None:
+                writers[statement.name] = index
+
+        return ready
+
+    # Main interpreter logic that executes each statement, dispatching the statements that can be computed once the
+    #   statement before them is executed
+    def execute(self):
+        try:
+            self.dispatch()
+
+            for self.index, statement in enumerate(self.program.statements):
+                self.execute_statement(statement)
+                self.dispatch()
+
+        except InterpreterError as e:
+            self.show_error(e)
+        finally:
+            self.output.flush()
+
+            # The statements that were not reached due to an error are discarded
+            if self.pool is not None:
+                self.pool.terminate()
+
+    # Dispatches the statements that can be computed after the statement being executed, with the variables they read
+    def dispatch(self):
+        for index, names in self.ready.pop(self.index, ()):
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.workers, init_dataflow_worker, (bytes(self.program.code),))
+
+            variables = {name: self.variables[name] for name in names if name in self.variables}
+            self.results[index] = self.pool.apply_async(evaluate_dataflow_statement, (index, variables))
+
+    # Evaluates the expression of the statement being executed, or returns its value computed by a worker process
+    def evaluate_expression(self, node):
+        result = self.results.pop(self.index, None)
+
+        if result is None:
+            return super().evaluate_expression(node)
+
+        value, failure = result.get()
+        if failure is not None:
+            raise self.error(*failure)
+
+        return value
+
+
+# Returns the names of the variables read by an expression, and if it has a RAISE or ROOT operation
+def get_dataflow_reads(node):
+    names = set()
+    dispatched = False
+    nodes = [node]
+
+    while nodes:
+        node = nodes.pop()
+
+        if type(node) is Identifier:
+            names.add(node.name)
+        elif type(node) is Arithmetic:
+            if node.operator in dataflow_operators:
+                dispatched = True
+            nodes.extend(node.operands)
+
+    return names, dispatched
+
+
+# Operators whose operations are computed by the worker processes of a DataflowInterpreter
+dataflow_operators = (TokenType.ADVANCED_OPERATOR_EXP, TokenType.ADVANCED_OPERATOR_ROOT)
+
+
+# DataflowWorkerInterpreter class that computes the statements of a DataflowInterpreter in a worker process
+# The message and site of its error are kept, so that the error is raised again once the statement is reached
+class DataflowWorkerInterpreter(Interpreter):
+    def __init__(self, _program):
+        super().__init__(_program)
+        self.failure = None                 # Contains the message and site of the error of the statement
+
+    def error(self, message, site):
+        self.failure = message, site
+        return super().error(message, site)
+
+
+# Program of the worker process of a DataflowInterpreter; set once per worker by init_dataflow_worker
+dataflow_worker = {}
+
+
+# Initializes a worker process of a DataflowInterpreter, which parses the source code of the program again
+#   instead of receiving its statements, so that the statements are referred to by their index
+def init_dataflow_worker(code):
+    dataflow_worker["program"] = Optimizer(Parser(Lexer(code)).parse()).optimize()
+
+
+# Computes the value of the expression of a statement in a worker process, given the variables it reads
+# Returns the value, or the message and site of the error of the statement
+def evaluate_dataflow_statement(index, variables):
+    interpreter = DataflowWorkerInterpreter(dataflow_worker["program"])
+    interpreter.variables = variables
+
+    try:
+        return interpreter.evaluate_expression(dataflow_worker["program"].statements[index].expression), None
+    except InterpreterError:
+        return None, interpreter.failure
+
+
+# DeferredValue class that holds an expression whose value is computed only once it is read, with the values of
+#   the variables it reads when it was reached; a variable that is itself deferred keeps its DeferredValue
+class DeferredValue:
+    __slots__ = ("expression", "variables", "value")
+
+    def __init__(self, _expression, _variables):
+        self.expression = _expression
+        self.variables = _variables
+        self.value = None                   # Contains the computed Value, once the expression is computed
+
+
+# LazyInterpreter class that executes a program while computing the values of the variables only once they are
+#   read by an expression, by PRINT and PRINTLN or by the symbols table
+# Only the expressions that cannot raise an error are deferred, so the errors are raised where the Interpreter
+#   raises them; a value assigned again before it is read is never computed
+# Without the symbols table, the values of the variables that are never read are never computed
+class LazyInterpreter(Interpreter):
+    def __init__(self, _program, _output=None, _inputs=None, _symbols=True):
+        super().__init__(_program, _output, _inputs)
+        self.symbols = _symbols
+        self.deferred = {}                  # Contains the DeferredValue of each variable whose value is not computed
+
+    # Main interpreter logic that executes each statement, then computes the values of the symbols table
+    def execute(self):
+        super().execute()
+
+        if self.symbols:
+            for name in list(self.deferred):
+                self.resolve_variable(name)
+
+    # Skips an expression evaluated as a statement if it cannot raise an error, since its value is not used
+    def execute_statement(self, statement):
+        if type(statement) is Evaluation and self.is_deferrable(statement.expression):
+            return
+        super().execute_statement(statement)
+
+    # Executes the STORE statement, deferring its expression if it cannot raise an error
+    def store(self, statement):
+        variable = self.get_variable(statement.name)
+
+        if variable is None or variable.type is not TokenType.NUMBER or \
+                not self.is_deferrable(statement.expression):
+            return super().store(statement)
+
+        self.deferred[statement.name] = self.defer(statement.expression)
+
+        # The computed operations that read the variable are computed again once reached
+        for key in self.memo_keys.pop(statement.name, ()):
+            self.memo.pop(key, None)
+
+    # Executes the VARINT and VARSTR statements, deferring the expression of VARINT if it cannot raise an error
+    def assign(self, statement):
+        if statement.type is not TokenType.NUMBER or statement.expression is None or \
+                not self.is_deferrable(statement.expression):
+            return super().assign(statement)
+
+        deferred = self.defer(statement.expression)
+
+        self.declare_variable(statement.name, statement.type, None, statement.site)
+        self.deferred[statement.name] = deferred
+
+    # Sets a value to an existing variable, which discards its deferred value
+    def assign_value_variable(self, name, value, site):
+        super().assign_value_variable(name, value, site)
+        self.deferred.pop(name, None)
+
+    # Computes the deferred value of a variable before it is read
+    def evaluate_value(self, node):
+        if type(node) is Identifier and node.name in self.deferred:
+            self.resolve_variable(node.name)
+
+        return super().evaluate_value(node)
+
+    # Returns True if an expression cannot raise an error, given the variables declared so far
+    # An arithmetic operation is deferred if it reads declared INTEGER variables with a value and NUMBER literals,
+    #   and its operators cannot fail: RAISE only to a literal exponent that is not negative, and MOD only by a
+    #   literal that is not zero; a lone literal or variable costs nothing to evaluate, so it is not deferred
+    def is_deferrable(self, node):
+        if type(node) is not Arithmetic:
+            return False
+
+        nodes = [node]
+
+        while nodes:
+            node = nodes.pop()
+
+            if type(node) is Arithmetic:
+                if node.operator is TokenType.ADVANCED_OPERATOR_EXP:
+                    if not is_number_literal(node.operands[-1], lambda number: number >= 0):
+                        return False
+                elif node.operator is TokenType.BASIC_OPERATOR_MOD:
+                    if not is_number_literal(node.operands[-1], lambda number: number != 0):
+                        return False
+                elif node.operator not in lazy_operators:
+                    return False
+
+                nodes.extend(node.operands)
+            elif type(node) is Identifier:
+                variable = self.variables.get(node.name)
+
+                if variable is None or variable.type is not TokenType.NUMBER or \
+                        variable.value is None and node.name not in self.deferred:
+                    return False
+            elif type(node) is not Literal or node.value.type is not TokenType.NUMBER:
+                return False
+
+        return True
+
+    # Returns the DeferredValue of an expression, with the current values of the variables it reads
+    def defer(self, expression):
+        variables = {}
+
+        for name in get_dataflow_reads(expression)[0]:
+            if name in self.deferred:
+                variables[name] = self.deferred[name]
+            else:
+                variable = self.variables[name]
+                variables[name] = Value(variable.type, variable.value, variable.number)
+
+        return DeferredValue(expression, variables)
+
+    # Computes the deferred value of a variable and sets it to the variable
+    def resolve_variable(self, name):
+        value = compute_deferred_value(self.program, self.deferred.pop(name))
+
+        variable = self.variables[name]
+        variable.value = value.value
+        variable.number = value.number
+
+
+# Operators whose operations cannot fail, so that the expressions of a LazyInterpreter using them are deferred
+lazy_operators = (TokenType.BASIC_OPERATOR_ADD, TokenType.BASIC_OPERATOR_SUB, TokenType.BASIC_OPERATOR_MUL)
+
+
+# Returns True if a node is a NUMBER literal whose number passes the given check
+def is_number_literal(node, check):
+    return type(node) is Literal and node.value.type is TokenType.NUMBER and check(node.value.number)
+
+
+# Computes a DeferredValue, after the deferred values of the variables it reads
+# The deferred values are kept in a list instead of recursion, so chains of deferred values of any length use a
+#   constant depth of the Python stack
+def compute_deferred_value(program, deferred):
+    pending = [deferred]
+
+    while pending:
+        top = pending[-1]
+
+        if top.value is not None:
+            pending.pop()
+            continue
+
+        reads = [value for value in top.variables.values() if type(value) is DeferredValue and value.value is None]
+        if reads:
+            pending.extend(reads)
+            continue
+
+        pending.pop()
+
+        interpreter = Interpreter(program)
+        interpreter.variables = {name: value.value if type(value) is DeferredValue else value
+                                 for name, value in top.variables.items()}
+        top.value = interpreter.evaluate_expression(top.expression)
+        # The values read are no longer needed once the value is computed
+        top.variables = None
+
+    return deferred.value
+
+
+# ProgramCache class that keeps the compiled programs in .ipolc files, like __pycache__ does for Python modules
+# A cached program is only used if it was compiled from the same source code by the same interpreter version
+# Each engine has its own cache file since each engine runs a different compiled form of the program
+class ProgramCache:
+    directory_name = "__ipolcache__"
+    extension = ".ipolc"
+
+    def __init__(self, _directory=None):
+        self.directory = _directory         # Directory of the cache files; None to keep them next to the sources
+
+    # Returns the key of a source code: the hash of the source code and the version of the interpreter
+    @staticmethod
+    def get_key(contents):
+        return hashlib.sha256(get_source_bytes(contents)).hexdigest(), get_interpreter_version()
+
+    # Returns the path of the cache file of a source file for the given engine
+    def get_path(self, file_path, engine):
+        file_path = pathlib.Path(file_path)
+        file_name = file_path.stem + "." + engine
+
+        if self.directory is None:
+            return file_path.parent / self.directory_name / (file_name + self.extension)
+
+        # Cache files of different source directories are kept apart in a shared directory
+        path_hash = hashlib.sha256(str(file_path.absolute()).encode("utf-8")).hexdigest()[:16]
+        return pathlib.Path(self.directory) / (file_name + "." + path_hash + self.extension)
+
+    # Returns the compiled program and token table of the cached program, or None if the cache is missing or
+    #   outdated
+    def load(self, file_path, engine, key, code):
+        # Only the programs of source files are kept in cache files
+        if file_path is None:
+            return None
+
+        try:
+            with open(self.get_path(file_path, engine), "rb") as file:
+                cached_key, data, columns = pickle.load(file)
+        except Exception:
+            return None
+
+        if cached_key != key:
+            return None
+
+        # The array columns of the token table are saved as they are
+        tokens = TokenTable(code)
+        tokens.types, tokens.line_nos, tokens.offsets = columns
+
+        return self.unpack(engine, data, Program(code, None)), tokens
+
+    # Saves the compiled program and token table of a program; the cache is skipped if the file cannot be written
+    def store(self, file_path, engine, key, compiled, tokens):
+        if file_path is None:
+            return
+
+        path = self.get_path(file_path, engine)
+        temp_path = path.with_name(path.name + "." + str(os.getpid()))
+        columns = tokens.types, tokens.line_nos, tokens.offsets
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                pickle.dump((key, self.pack(compiled), columns), file, pickle.HIGHEST_PROTOCOL)
+            # Replaces the cache file at once so that other processes never read a partial file
+            os.replace(temp_path, path)
+        # The statements of deeply nested expressions are too deep to be pickled, so these programs are not cached
+        except (OSError, pickle.PicklingError, RecursionError):
+            if temp_path.exists():
+                temp_path.unlink()
+
+    # Returns the data of a compiled program to be saved; the source code is not saved since the key comes from it
+    @staticmethod
+    def pack(compiled):
+        if isinstance(compiled, Bytecode):
+            return compiled.code, compiled.constants, compiled.sites, compiled.names, compiled.slot_types
+        if isinstance(compiled, TranspiledProgram):
+            return marshal.dumps(compiled.code), compiled.names, compiled.slot_types, compiled.errors
+        return compiled.statements
+
+    # Returns the compiled program of the saved data for the program of the source code
+    @staticmethod
+    def unpack(engine, data, program):
+        if engine == "vm":
+            return Bytecode(program, *data)
+        if engine == "python":
+            return TranspiledProgram(program, marshal.loads(data[0]), *data[1:])
+        program.statements = data
+        return program
+
+
+# MemoryProgramCache class that keeps the compiled programs in memory, for the programs run by the server
+# Programs are looked up by the hash of their source code, so the same program is only compiled once whether it is
+#   sent as source code or as a file path; the least recently used program is dropped once the cache is full
+class MemoryProgramCache:
+    def __init__(self, _size):
+        self.size = _size
+        self.programs = {}                  # Contains the compiled program and token table of each key and engine
+
+    # Returns the key of a source code, which is the hash of the source code
+    @staticmethod
+    def get_key(contents):
+        return hashlib.sha256(get_source_bytes(contents)).hexdigest()
+
+    # Returns the compiled program and token table of the program, or None if it is not in the cache
+    def load(self, file_path, engine, key, code):
+        cached = self.programs.pop((key, engine), None)
+
+        # The program is moved to the end as the most recently used
+        if cached is not None:
+            self.programs[(key, engine)] = cached
+
+        return cached
+
+    # Keeps the compiled program and token table of a program; the compiled programs are never modified when run
+    def store(self, file_path, engine, key, compiled, tokens):
+        self.programs[(key, engine)] = compiled, tokens
+
+        if len(self.programs) > self.size:
+            del self.programs[next(iter(self.programs))]
+
+
+# Returns the version of the interpreter, which is the hash of this script
+def get_interpreter_version():
+    global interpreter_version
+
+    if interpreter_version is None:
+        with open(__file__, "rb") as file:
+            interpreter_version = hashlib.sha256(file.read()).hexdigest()
+
+    return interpreter_version
+
+
+interpreter_version = None
+
+
+# Execution engines that can run a parsed program
+engines = ["ast", "vm", "python"]
+
+
+# Returns the compiled form of the parsed program that is run by the given engine
+def compile_program(program, engine):
+    if engine == "vm":
+        return Compiler(program).compile()
+    if engine == "python":
+        return Transpiler(program).transpile()
+    return program
+
+
+# Returns the interpreter of the given engine for the compiled program; its output is written to the given
+#   OutputWriter and its INPUT values are read from the given input provider, or the standard output and input
+#   by default
+# The run is stopped with an error once it exceeds one of the given ExecutionLimits
+def create_interpreter(compiled, engine, output=None, inputs=None, limits=None):
+    if engine == "vm":
+        return VirtualMachine(compiled, output, inputs, limits)
+    if engine == "python":
+        return PythonInterpreter(compiled, output, inputs, limits)
+    return Interpreter(compiled, output, inputs, limits)
+
+
+# Returns the error message if the file cannot be run as an INTERPOL program, None if it can be run
+def check_source_file(file_path):
+    # Check if the file extension is correct
+    if not pathlib.Path(file_path).suffix == ".ipol":
+        return InterpreterError.INVALID_FILE
+
+    # Check if the file exists
+    if not os.path.isfile(file_path):
+        return InterpreterError.FILE_NOT_FOUND
+
+    # Check if the file has contents
+    if not os.path.getsize(file_path) > 0:
+        return InterpreterError.FILE_EMPTY
+
+    return None
+
+
+# Returns the source code of a file as a read-only mmap, so that large files are lexed without copying them
+# The bytes are checked the same way as a text file read using utf-8 encoding: new lines are translated and an
+#   invalid UTF-8 file raises a UnicodeDecodeError
+def read_source(file_path):
+    with open(file_path, "rb") as file:
+        contents = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # Carriage returns are translated to new lines, as universal newlines mode does
+    if contents.find(b"\r") != -1:
+        contents = contents[:].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    # Only a source code with non-ASCII bytes needs to be decoded to be checked
+    if non_ascii_pattern.search(contents) is not None:
+        contents[:].decode("utf-8")
+
+    return contents
+
+
+# Returns the compiled program of the source code for the given engine and the tokens of the source code
+# The tokens are added to the given TokenTable, TokenCounter or TokenStream; a new TokenTable by default
+# If a cache is given, the program is loaded from the cache instead when the source code did not change
+# If a Profiler is given, the time spent on lexing and parsing each line is added to it
+def load_program(contents, engine, file_path=None, cache=None, tokens=None, profiler=None):
+    code = get_source_bytes(contents)
+    key = None
+
+    if tokens is None:
+        tokens = TokenTable(code)
+
+    if cache is not None:
+        key = cache.get_key(code)
+        cached = cache.load(file_path, engine, key, code)
+
+        if cached is not None:
+            compiled, cached_tokens = cached
+            tokens.extend(cached_tokens)
+            return compiled, tokens
+
+    # Source code passed to lexer to be tokenized
+    lexer = Lexer(code) if profiler is None else ProfilingLexer(code, profiler)
+    # lexer instance passed to parser, which processes each token
+    parser = Parser(lexer, tokens)
+    # Starts the parsing process, then the parsed program is simplified before it is compiled
+    compiled = compile_program(Optimizer(parser.parse()).optimize(), engine)
+
+    # Only a program parsed with its whole token table can be cached
+    if key is not None and type(tokens) is TokenTable:
+        cache.store(file_path, engine, key, compiled, tokens)
+
+    return compiled, tokens
+
+
+# Returns the variable name, data type and value of each variable for the SYMBOLS table
+def get_symbol_rows(interpreter):
+    for variable in interpreter.variables.values():
+        typ = "INTEGER" if variable.type is TokenType.NUMBER else "STRING"
+        val = "" if variable.value is None else str(variable.value)
+        yield variable.name, typ, val
+
+
+# Runs an INTERPOL file with the given INPUT values and returns the result of the run as a dictionary:
+#   the output, the rows of the LEXEMES/TOKENS and SYMBOLS tables, the error that stopped the program and
+#   the Python exception that stopped the interpreter, if any
+def run_file(file_path, inputs, engine="ast", cache=None, limits=None):
+    file_error = check_source_file(file_path)
+
+    if file_error is not None:
+        result = get_empty_result(file_path)
+        result["error"] = file_error
+        return result
+
+    return run_source(read_source(file_path), inputs, engine, cache, file_path, limits)
+
+
+# Returns the result of a program that did not run
+def get_empty_result(file_path=None):
+    return {"file": None if file_path is None else str(file_path), "output": "", "tokens": [], "symbols": [],
+            "error": None, "exception": None}
+
+
+# Runs the source code of an INTERPOL program with the given INPUT values and returns the result of the run
+def run_source(contents, inputs, engine="ast", cache=None, file_path=None, limits=None):
+    try:
+        compiled, tokens = load_program(contents, engine, file_path, cache)
+    except Exception as e:
+        result = get_empty_result(file_path)
+        result["exception"] = type(e).__name__ + ": " + str(e)
+        return result
+
+    return run_compiled(compiled, engine, ListInput(inputs), tokens, file_path, limits)
+
+
+# Runs a compiled program with the INPUT values of the input provider and returns the result of the run
+# The rows of the LEXEMES/TOKENS table are only included if the tokens are given
+def run_compiled(compiled, engine, inputs, tokens=None, file_path=None, limits=None):
+    result = get_empty_result(file_path)
+    output = OutputWriter(io.StringIO(), "end")
+
+    try:
+        interpreter = create_interpreter(compiled, engine, output, inputs, limits)
+        interpreter.execute()
+    except Exception as e:
+        result["exception"] = type(e).__name__ + ": " + str(e)
+        return result
+    finally:
+        output.flush()
+        result["output"] = output.stream.getvalue()
+
+    if tokens is not None:
+        token_count = len(tokens) if interpreter.token_count is None else interpreter.token_count
+        result["tokens"] = [[line_no, token_type.name, lexeme]
+                            for line_no, token_type, lexeme in tokens.rows(token_count)]
+
+    result["symbols"] = [list(row) for row in get_symbol_rows(interpreter)]
+
+    if interpreter.exception is not None:
+        result["error"] = str(interpreter.exception)
+
+    return result
+
+
+# Runs an INTERPOL file once for each row of a CSV file, whose values are the INPUT values of the run, and writes
+#   the result of each run as a line of JSON with the index of its row; the file is only parsed once
+# The results have no rows of the LEXEMES/TOKENS table since all the runs have the same tokens
+# If vectorize is set, the rows are run together by the VectorEngine, a chunk of rows at a time; the rows are
+#   still run one at a time if there are limits, since each run has its own limits
+def run_rows(file_path, csv_path, engine="ast", cache=None, vectorize=False, limits=None):
+    output = OutputWriter(sys.stdout)
+    file_error = check_source_file(file_path)
+
+    if file_error is not None:
+        result = get_empty_result(file_path)
+        result["error"] = file_error
+        output.print(json.dumps(result))
+        output.flush()
+        return
+
+    # The VectorEngine runs the parsed program, as the ast engine does
+    vectorize = vectorize and limits is None
+    if vectorize:
+        engine = "ast"
+
+    compiled = load_program(read_source(file_path), engine, file_path, cache)[0]
+    index = 0
+
+    with open(csv_path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+
+        while True:
+            rows = list(itertools.islice(reader, vector_chunk_size))
+            if not rows:
+                break
+
+            if vectorize:
+                results = VectorEngine(compiled, rows).run()
+            else:
+                results = [run_compiled(compiled, engine, ListInput(row), None, None, limits) for row in rows]
+
+            for result in results:
+                del result["tokens"]
+                result["file"] = str(file_path)
+                result["row"] = index
+                index += 1
+                output.print(json.dumps(result))
+
+    output.flush()
+
+
+# Number of rows of the CSV file run at once by run_rows
+vector_chunk_size = 1 << 16
+
+
+# Returns the source files of the batch runner matched by the glob patterns, in order and without duplicates
+# A pattern that does not match any file is kept as it is so that its error is part of the results
+def get_batch_files(patterns):
+    files = []
+
+    for pattern in patterns:
+        files.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])
+
+    return list(dict.fromkeys(files))
+
+
+# Returns the INPUT values of a source file: the lines of the .in file with the same name as the source file,
+#   which is looked up in the inputs directory if given, or next to the source file
+def get_batch_inputs(file_path, inputs_directory=None):
+    file_path = pathlib.Path(file_path)
+    directory = file_path.parent if inputs_directory is None else pathlib.Path(inputs_directory)
+    input_path = directory / (file_path.stem + ".in")
+
+    if not input_path.is_file():
+        return []
+
+    return read_input_values(input_path)
+
+
+# Settings of the worker process of the batch runner; set once per worker by init_batch_worker
+batch_worker = {}
+
+
+# Initializes a worker process of the batch runner, which is reused for all the files given to it
+def init_batch_worker(engine, cache_directory, no_cache, inputs_directory, limits):
+    batch_worker["engine"] = engine
+    batch_worker["cache"] = None if no_cache else ProgramCache(cache_directory)
+    batch_worker["inputs_directory"] = inputs_directory
+    batch_worker["limits"] = limits
+
+
+# Runs a file of the batch in a worker process
+def run_batch_file(file_path):
+    inputs = get_batch_inputs(file_path, batch_worker["inputs_directory"])
+    return run_file(file_path, inputs, batch_worker["engine"], batch_worker["cache"], batch_worker["limits"])
+
+
+# Runs all the files of the batch across a pool of worker processes, and writes the result of each file as a
+#   line of JSON in the order of the files
+def run_batch(patterns, workers=None, engine="ast", cache_directory=None, no_cache=False, inputs_directory=None,
+              limits=None):
+    files = get_batch_files(patterns)
+    settings = (engine, cache_directory, no_cache, inputs_directory, limits)
+
+    with multiprocessing.Pool(workers, init_batch_worker, settings) as pool:
+        for result in pool.imap(run_batch_file, files, chunksize=batch_chunk_size):
+            print(json.dumps(result), flush=True)
+
+
+# Number of files sent at once to a worker process of the batch runner
+batch_chunk_size = 4
+
+
+# StatementCheck class that holds what the check-only mode needs of a statement parsed on its own, without its
+#   nodes: its syntax error, its first and last tokens for the checks of BEGIN and END, and the variables it
+#   declares, reads and assigns, in the order that they are reached when it is executed
+# The sites are sites of the whole source code, with the offsets from its start
+class StatementCheck:
+    def __init__(self, _analysis, _offset, _stop, _line_no):
+        self.offset = _offset               # Offset where the statement starts
+        self.stop = _stop                   # Offset where the next statement starts
+        self.line_no = _line_no
+        self.line_count = _analysis.line_count
+        self.first_type = _analysis.first_type
+        self.first_site = self.get_site(_analysis.first_site)
+        self.last_site = self.get_site(_analysis.last_site)
+        self.failure = None                 # Contains the message and site of the syntax error
+        self.variables = []                 # Contains the name and site of each variable used, and if it is declared
+
+        if _analysis.failure is not None:
+            self.failure = _analysis.failure.message, self.get_site(_analysis.failure.site)
+
+        statement = _analysis.statement
+
+        if type(statement) in (Output, Declaration, Assignment, Evaluation):
+            self.add_reads(statement.expression)
+
+        if type(statement) is Declaration:
+            self.variables.append((statement.name, self.get_site(statement.site), True))
+        elif type(statement) is Assignment:
+            self.variables.append((statement.name, self.get_site(statement.site), False))
+        elif type(statement) is Input and statement.assign_site is not None:
+            self.variables.append((statement.name, self.get_site(statement.assign_site), False))
+
+    # Adds the variables read by the expression, from left to right
+    def add_reads(self, node):
+        nodes = [node]
+
+        while nodes:
+            node = nodes.pop()
+
+            if type(node) is Identifier:
+                self.variables.append((node.name, self.get_site(node.site), False))
+            elif type(node) is Arithmetic:
+                nodes.extend(reversed(node.operands))
+
+    # Returns the site of the source code of a site of the statement
+    def get_site(self, site):
+        if site is None:
+            return None
+        return self.line_no + site[0] - 1, self.offset + site[1], self.offset + site[2], site[3]
+
+
+# Returns the check of the statement that starts at the given offset and line number of the source code
+# The next lines are added one by one while the statement reads past the end of its lines
+def check_statement(code, offset, line_no):
+    stop = offset
+    line_count = 0
+
+    while True:
+        new_line = code.find(b"\n", stop)
+        stop = len(code) if new_line == -1 else new_line + 1
+        line_count += 1
+
+        analysis = LineAnalysis(code[offset:stop], line_count)
+        if not analysis.reads_next_line or stop == len(code):
+            return StatementCheck(analysis, offset, stop, line_no)
+
+
+# Returns the chunks of the source code checked by the worker processes: the start and stop offsets of each chunk,
+#   which end at a new line, and the line number where it starts
+def get_check_chunks(code):
+    chunks = []
+    start = 0
+    line_no = 1
+
+    while start < len(code):
+        new_line = code.find(b"\n", start + check_chunk_size)
+        stop = len(code) if new_line == -1 else new_line + 1
+
+        chunks.append((start, stop, line_no))
+        line_no += code[start:stop].count(b"\n")
+        start = stop
+
+    return chunks
+
+
+# Number of bytes of the source code checked at once by a worker process of the check-only mode
+check_chunk_size = 1 << 20
+
+
+# Checks the statements that start in a chunk of a source file in a worker process
+# A statement that starts in a chunk can end in the next one, so the next chunk can start within a statement; this
+#   is found when the checks of the chunks are merged
+def check_chunk(chunk):
+    file_path, start, stop, line_no = chunk
+    code = read_source(file_path)
+    checks = []
+
+    while start < stop:
+        check = check_statement(code, start, line_no)
+        checks.append(check)
+        start = check.stop
+        line_no += check.line_count
+
+    return checks
+
+
+# Returns the diagnostics of a source code from the checks of its chunks, in a single pass over its statements
+# A chunk whose first statement starts before the end of the last statement of the chunk before is checked again
+#   from there, until its statements start at the same offsets
+# The variables are checked in the order of the statements: a variable must be declared before it is read or
+#   assigned, and only once; a variable is declared even if its statement has an error, so that it is reported once
+def check_program(code, chunk_checks):
+    diagnostics = []
+    declared = set()
+    offset = 0
+    line_no = 1
+    first = None                            # Contains the check of the first statement with tokens
+    end = None                              # Contains the check of the first END statement
+    last = None                             # Contains the check of the last statement with tokens
+
+    for (start, stop, _), checks in chunk_checks:
+        checks = {check.offset: check for check in checks}
+
+        while offset < stop:
+            check = checks.get(offset) or check_statement(code, offset, line_no)
+            offset = check.stop
+            line_no += check.line_count
+
+            if first is None and (check.first_site is not None or check.failure is not None):
+                first = check
+
+                # Make sure the first statement is BEGIN
+                if check.first_type is not None and check.first_type is not TokenType.PROGRAM_BEGIN:
+                    diagnostics.append(get_check_diagnostic(code, InterpreterError.INVALID_SYNTAX, check.first_site))
+
+            if check.first_type is TokenType.PROGRAM_END:
+                if end is not None:
+                    diagnostics.append(get_check_diagnostic(code, InterpreterError.INVALID_SYNTAX, check.first_site))
+                end = check
+
+            if check.last_site is not None:
+                last = check
+
+            failure = None
+
+            for name, site, declares in check.variables:
+                if failure is None and declares == (name in declared):
+                    failure = InterpreterError.DUPLICATE_VARIABLE if declares else \
+                        InterpreterError.VARIABLE_NOT_DECLARED, site
+                if declares:
+                    declared.add(name)
+
+            # The syntax error is reached after the variables of the statement
+            if failure is None:
+                failure = check.failure
+            if failure is not None:
+                diagnostics.append(get_check_diagnostic(code, *failure))
+
+    if end is None and last is not None:
+        diagnostics.append(get_check_diagnostic(code, InterpreterError.INVALID_EOF, last.last_site))
+
+    return diagnostics
+
+
+# Returns the diagnostic of an error at a site of the source code
+def get_check_diagnostic(code, kind, site):
+    return Diagnostic(site[0], kind, site[2] - site[1],
+                      code[site[1]:site[2]].replace(b"\n", b"").decode("utf-8", "replace"))
+
+
+# Returns the chunks of a source file to be checked, or the error of a file that cannot be checked
+def get_file_chunks(file_path):
+    file_error = check_source_file(file_path)
+
+    if file_error is not None:
+        return file_error, []
+
+    try:
+        code = read_source(file_path)
+    except UnicodeDecodeError:
+        return InterpreterError.INVALID_FILE, []
+
+    return None, [(file_path,) + chunk for chunk in get_check_chunks(code)]
+
+
+# Checks the syntax, the declarations of the variables and the placement of BEGIN and END of all the files, without
+#   executing them, and writes the result of each file as a line of JSON in the order of the files; returns True
+#   if all the files are valid
+# The chunks of all the files are lexed and parsed across a pool of worker processes, then the checks of the chunks
+#   of each file are merged in a single pass over its statements
+def run_check(patterns, workers=None):
+    files = [(file_path,) + get_file_chunks(file_path) for file_path in get_batch_files(patterns)]
+    all_valid = True
+
+    with multiprocessing.Pool(workers) as pool:
+        checks = pool.imap(check_chunk, [chunk for _, _, chunks in files for chunk in chunks])
+
+        for file_path, file_error, chunks in files:
+            chunk_checks = [(chunk[1:], next(checks)) for chunk in chunks]
+            diagnostics = [] if file_error is not None else check_program(read_source(file_path), chunk_checks)
+            valid = file_error is None and not diagnostics
+
+            print(json.dumps({"file": str(file_path), "valid": valid, "error": file_error,
+                              "diagnostics": [diagnostic.to_dict() for diagnostic in diagnostics]}), flush=True)
+            all_valid = all_valid and valid
+
+    return all_valid
+
+
+# InterpreterServer class that runs the programs sent over a Unix domain socket by a pool of worker processes
+# Each request is a line of JSON with either the source code ("source") or the path ("file") of the program, and
+#   optionally its INPUT values ("inputs") and engine ("engine"); each response is a line of JSON with the result
+#   of the run, like the results of the batch runner
+# Connections are handled by threads, so the requests of different connections are run at the same time
+class InterpreterServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, _socket_path, _pool):
+        self.pool = _pool
+        super().__init__(_socket_path, ServerRequestHandler)
+
+
+# ServerRequestHandler class that reads the requests of a connection and writes their responses
+class ServerRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                result = get_empty_result()
+                result["exception"] = type(e).__name__ + ": " + str(e)
+            else:
+                result = self.server.pool.apply(run_server_request, (request,))
+
+            self.wfile.write(json.dumps(result).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+# Cache and limits of the worker process of the server; set once per worker by init_server_worker
+server_worker = {}
+
+
+# Initializes a worker process of the server, which keeps its compiled programs in memory for all its requests
+def init_server_worker(cache_size, limits):
+    server_worker["cache"] = MemoryProgramCache(cache_size)
+    server_worker["limits"] = limits
+
+
+# Runs a request of the server in a worker process
+def run_server_request(request):
+    engine = request.get("engine", "ast") if isinstance(request, dict) else None
+    inputs = request.get("inputs", []) if isinstance(request, dict) else None
+
+    if engine not in engines or not isinstance(inputs, list) or not all(isinstance(value, str) for value in inputs):
+        result = get_empty_result()
+        result["exception"] = "ValueError: invalid request"
+        return result
+
+    if isinstance(request.get("source"), str):
+        return run_source(request["source"], inputs, engine, server_worker["cache"], None, server_worker["limits"])
+    if isinstance(request.get("file"), str):
+        return run_file(request["file"], inputs, engine, server_worker["cache"], server_worker["limits"])
+
+    result = get_empty_result()
+    result["exception"] = "ValueError: the request has no source nor file"
+    return result
+
+
+# Runs the server on the Unix domain socket until it is interrupted
+def serve(socket_path, workers=None, cache_size=None, limits=None):
+    # A socket file left by a previous server is replaced
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with multiprocessing.Pool(workers, init_server_worker, (cache_size or server_cache_size, limits)) as pool:
+        with InterpreterServer(socket_path, pool) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(socket_path)
+
+
+# Number of compiled programs kept in memory by each worker process of the server
+server_cache_size = 256
+
+
+# Runs the incremental analysis of a source code being edited, for editors: reads a JSON request per line and writes
+#   the JSON response of each
+# {"source": ...} starts the analysis of a new source code, and {"line": ..., "count": ..., "lines": [...]} replaces
+#   count lines from the line number with the given lines
+# The response has the diagnostics of the statements from its first line to its last line, which replace the
+#   previous diagnostics of these lines, and the diagnostics of the whole program, which replace all the previous ones
+def run_analyzer(requests, responses):
+    analyzer = IncrementalAnalyzer()
+
+    for line in requests:
+        try:
+            request = json.loads(line)
+
+            if not isinstance(request, dict):
+                raise ValueError("invalid request")
+
+            if isinstance(request.get("source"), str):
+                analyzer = IncrementalAnalyzer()
+                update = analyzer.edit(1, len(analyzer.lines), request["source"].split("\n"))
+            else:
+                line_no, count, lines = request.get("line"), request.get("count", 0), request.get("lines")
+
+                if type(line_no) is not int or type(count) is not int or not isinstance(lines, list) or \
+                        not all(isinstance(text, str) for text in lines):
+                    raise ValueError("invalid request")
+
+                update = analyzer.edit(line_no, count, lines)
+        except ValueError as e:
+            result = {"exception": type(e).__name__ + ": " + str(e)}
+        else:
+            result = {"first_line": update[0], "last_line": update[1],
+                      "diagnostics": [diagnostic.to_dict() for diagnostic in update[2]],
+                      "program_diagnostics": [diagnostic.to_dict() for diagnostic in update[3]]}
+
+        responses.write(json.dumps(result) + "\n")
+        responses.flush()
+
+
+# Returns the source code of a synthetic INTERPOL program and its INPUT values, for benchmarks
+# The program grows with the scale: it has 10 variables per scale, and each scale adds statements with deeply
+#   nested expressions, MEAN of all the variables, long string literals and large RAISE and ROOT operations
+# Values are kept small with MOD and divisors are never zero, so the program runs without errors
+def generate_program(scale, seed=0, depth=None):
+    generator = random.Random(seed)
+    depth = depth or benchmark_depth
+    names = ["v%d" % index for index in range(10 * scale)]
+    lines = ["BEGIN", "# Synthetic program of scale %d" % scale]
+    inputs = []
+
+    # Returns a nested expression of the given depth whose value stays small
+    def expression(level):
+        if level == 0:
+            return generator.choice(names) if generator.random() < 0.7 else str(generator.randint(0, 999))
+
+        operator = generator.choice(["ADD", "SUB", "MUL", "DIV", "MOD"])
+        left = expression(level - 1)
+        right = generator.choice(names)
+
+        if operator == "DIV" or operator == "MOD":
+            right = "ADD 1 RAISE %s 2" % right
+        return "MOD %s %s %s 1000003" % (operator, left, right)
+
+    for name in names:
+        lines.append("VARINT %s WITH %d" % (name, generator.randint(1, 999)))
+
+    for index in range(scale):
+        text = "".join(generator.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(200))
+        target = generator.choice(names)
+
+        lines.append("VARSTR s%d WITH \"%s\"" % (index, text))
+        lines.append("STORE %s IN %s" % (expression(depth), target))
+        lines.append("PRINTLN MEAN %s" % " ".join(names))
+        lines.append("PRINTLN MOD RAISE %s 20000 1000007" % target)
+        lines.append("PRINTLN ROOT 3 RAISE %s 30" % generator.choice(names))
+        lines.append("PRINTLN DIST %s AND %s" % tuple(" ".join(generator.sample(names, 2)) for _ in range(2)))
+        lines.append("PRINT s%d" % index)
+        lines.append("INPUT %s" % generator.choice(names))
+        inputs.append(str(generator.randint(1, 999)))
+
+    lines.append("END")
+    return "\n".join(lines) + "\n", inputs
+
+
+# Depth of the nested expressions of the synthetic programs
+benchmark_depth = 100
+
+
+# Returns the shortest time of running the function a number of times, and its last result
+def get_best_time(function, repeat):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+
+# Returns the number of tokens of the source code, read by the lexer alone
+def count_tokens(code):
+    lexer = Lexer(code)
+    count = 0
+
+    while lexer.next_token().type is not TokenType.END_OF_FILE:
+        count += 1
+
+    return count + 1
+
+
+# Runs the source code with the engine from parsing to the end of the execution; returns the interpreter
+def run_benchmark_program(code, inputs, engine):
+    compiled = load_program(code, engine, None, None, TokenCounter())[0]
+    interpreter = create_interpreter(compiled, engine, OutputWriter(io.StringIO(), "end"), ListInput(inputs))
+    interpreter.execute()
+    return interpreter
+
+
+# Returns the benchmark of the synthetic program of a scale: the tokens read per second by the lexer, the
+#   statements parsed per second (including their lexing), the time of running the program with each engine and
+#   the peak memory allocated while it is parsed and run by the ast engine
+def benchmark_scale(scale, engines_run, repeat):
+    source, inputs = generate_program(scale)
+    code = get_source_bytes(source)
+
+    lex_time, tokens = get_best_time(lambda: count_tokens(code), repeat)
+    parse_time, program = get_best_time(lambda: Parser(Lexer(code), TokenCounter()).parse(), repeat)
+    result = {"scale": scale, "lines": source.count("\n"), "tokens": tokens,
+              "statements": len(program.statements), "lex_tokens_per_second": tokens / lex_time,
+              "parse_statements_per_second": len(program.statements) / parse_time, "runtime": {}}
+
+    for engine in engines_run:
+        runtime, interpreter = get_best_time(lambda: run_benchmark_program(code, inputs, engine), repeat)
+
+        # The synthetic programs never raise errors, so an error means that the engine is broken
+        if interpreter.exception is not None:
+            raise RuntimeError("%s engine: %s" % (engine, interpreter.exception))
+        result["runtime"][engine] = runtime
+
+    tracemalloc.start()
+    try:
+        run_benchmark_program(code, inputs, "ast")
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+
+# Runs the benchmarks of the scales, displays them next to the previous run saved in the results file, then adds
+#   them to the results file so that the next versions of the interpreter are compared with this one
+def run_benchmark(scales, engines_run, repeat, results_path):
+    path = pathlib.Path(results_path)
+    runs = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else []
+    previous = {result["scale"]: result for result in runs[-1]["results"]} if runs else {}
+
+    run = {"version": get_interpreter_version()[:12], "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "python": platform.python_version(), "results": []}
+
+    print("SCALE  LINES      MEASURE" + " " * 20 + "VALUE      PREVIOUS    CHANGE")
+
+    for scale in scales:
+        result = benchmark_scale(scale, engines_run, repeat)
+        run["results"].append(result)
+
+        rows = [("lexer tokens/s", result["lex_tokens_per_second"], "lex_tokens_per_second"),
+                ("parser statements/s", result["parse_statements_per_second"], "parse_statements_per_second"),
+                ("peak memory bytes", result["peak_memory"], "peak_memory")]
+        rows += [("%s runtime s" % engine, runtime, engine) for engine, runtime in result["runtime"].items()]
+
+        for measure, value, key in rows:
+            before = previous.get(scale, {})
+            before = before.get("runtime", {}).get(key) if key in engines else before.get(key)
+            change = "" if not before else "%+.1f%%" % ((value - before) * 100 / before)
+
+            print(str(scale).ljust(7) + str(result["lines"]).ljust(11) + measure.ljust(27) +
+                  get_benchmark_value(value).rjust(10) + get_benchmark_value(before).rjust(14) + change.rjust(10))
+
+    runs.append(run)
+    path.write_text(json.dumps(runs, indent=2), encoding="utf-8")
+
+
+# Returns a measure of the benchmark as text
+def get_benchmark_value(value):
+    if value is None:
+        return ""
+    if value < 10:
+        return "%.4f" % value
+    return "%d" % value
+
+
+# Main method executed when the script is called
+def main():
+    welcome_message = "========  INTERPOL INTERPRETER STARTED   ========\n"
+    output_message = "\n================ INTERPOL OUTPUT ================\n"
+    output_message_start = "----------------  OUTPUT START  ---------------->"
+    output_message_end = "\n<----------------- OUTPUT END -------------------"
+    token_list_header = "\n========= INTERPOL LEXEMES/TOKENS TABLE =========\n"
+    token_list_columns = "LINE NO.  TOKENS                          LEXEMES"
+    profile_header = "\n==================== PROFILE ====================\n"
+    profile_columns = "LINE NO.  COUNT  " + "".join(column.rjust(12) for column in ["TOTAL MS"] + [
+        phase.upper() for phase in Profiler.phases]) + "  OPERATORS"
+    termination_message = "\n======== INTERPOL INTERPRETER TERMINATED ========"
+    repl_message = "Input BEGIN to begin, then one statement per line. Input END to end.\n"
+
+    arg_parser = argparse.ArgumentParser(description="INTERPOL interpreter")
+    arg_parser.add_argument("--engine", choices=engines, default="ast",
+                            help="execution engine: ast walks the parsed program, vm runs it as bytecode, "
+                                 "python runs it translated to a Python function")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="always parse the source file instead of using its cached program")
+    arg_parser.add_argument("--cache-dir", help="directory of the cached programs (default: " +
+                            ProgramCache.directory_name + " next to the source file)")
+    arg_parser.add_argument("--no-tokens", action="store_true",
+                            help="do not keep the tokens, nor display the lexemes/tokens table")
+    arg_parser.add_argument("--tokens-file",
+                            help="write the lexemes/tokens table to this file while the tokens are read, instead of "
+                                 "keeping them to display the table")
+    arg_parser.add_argument("--batch", nargs="+", metavar="PATTERN",
+                            help="run all the .ipol files matched by the glob patterns across a pool of processes, "
+                                 "and write the result of each file as a line of JSON instead")
+    arg_parser.add_argument("--parallel", action="store_true",
+                            help="compute the RAISE and ROOT operations of the statements that do not depend on each "
+                                 "other at the same time on --workers processes, with the ast engine; the statements "
+                                 "are still executed in order; ignored with execution limits")
+    arg_parser.add_argument("--lazy", action="store_true",
+                            help="compute the values of the variables only once they are read, with the ast engine, "
+                                 "skipping the values assigned again before they are read; only the expressions that "
+                                 "cannot raise an error are deferred; ignored with execution limits")
+    arg_parser.add_argument("--no-symbols", action="store_true",
+                            help="do not display the symbols table; with --lazy, the values of the variables that "
+                                 "are never read are never computed")
+    arg_parser.add_argument("--check", nargs="+", metavar="PATTERN",
+                            help="check the syntax, the variable declarations and BEGIN and END of the .ipol files "
+                                 "matching the glob patterns without executing them, and write the result of each "
+                                 "file as a line of JSON; the exit status is 1 if any file is not valid")
+    arg_parser.add_argument("--workers", type=int,
+                            help="number of worker processes of the batch, check, parallel run or server (default: "
+                                 "number of CPUs)")
+    arg_parser.add_argument("--inputs-dir",
+                            help="directory of the INPUT values of the batch: the values of each source file are "
+                                 "the lines of the file with its name and .in extension (default: next to the "
+                                 "source file)")
+    arg_parser.add_argument("--serve", metavar="SOCKET",
+                            help="run as a server that runs the programs sent over this Unix domain socket by a "
+                                 "pool of --workers processes")
+    arg_parser.add_argument("--server-cache-size", type=int,
+                            help="number of compiled programs kept in memory by each worker process of the server "
+                                 "(default: " + str(server_cache_size) + ")")
+    arg_parser.add_argument("--output",
+                            help="write the output to this file instead of the standard output")
+    arg_parser.add_argument("--flush", choices=OutputWriter.policies, default="size",
+                            help="when the buffered output is written: after each new line, once the buffer is full "
+                                 "(default), or only at the end of the program; it is always written before INPUT")
+    arg_parser.add_argument("--buffer-size", type=int,
+                            help="size of the output buffer in characters (default: " +
+                                 str(OutputWriter.default_buffer_size) + ")")
+    arg_parser.add_argument("--inputs",
+                            help="read the INPUT values from this file, one value per line, instead of the standard "
+                                 "input")
+    arg_parser.add_argument("--run-rows", nargs=2, metavar=("PROGRAM", "CSV"),
+                            help="run the .ipol file once for each row of the CSV file, whose values are the INPUT "
+                                 "values of the run, and write the result of each run as a line of JSON")
+    arg_parser.add_argument("--vectorize", action="store_true",
+                            help="with --run-rows, run all the rows at once as columns of values, using NumPy if it "
+                                 "is installed")
+    arg_parser.add_argument("--max-operations", type=int,
+                            help="stop each run with an error once it computes this many arithmetic operations")
+    arg_parser.add_argument("--max-bit-length", type=int,
+                            help="stop each run with an error before it computes an arithmetic operation whose value "
+                                 "has more bits than this")
+    arg_parser.add_argument("--timeout", type=float,
+                            help="stop each run with an error once it runs for this many seconds")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="display the time spent on each line by lexing, parsing, arithmetic, io and the rest "
+                                 "of the execution after the symbols table, with the time of each operator; the "
+                                 "program is parsed without the cache and run with the ast engine")
+    arg_parser.add_argument("--profile-json",
+                            help="write the profile of each line to this JSON file; it implies --profile without "
+                                 "displaying the table unless --profile is also given")
+    arg_parser.add_argument("--benchmark", nargs="*", type=int, metavar="SCALE",
+                            help="benchmark the lexer, the parser, the engines and the memory on synthetic programs "
+                                 "of these scales (default: 1 10 50), and save the results to --benchmark-results")
+    arg_parser.add_argument("--benchmark-results", default="benchmark_results.json",
+                            help="JSON file where the benchmark results of each run are added, and compared with "
+                                 "the previous run (default: benchmark_results.json)")
+    arg_parser.add_argument("--repeat", type=int, default=3,
+                            help="number of times each benchmark is run; the shortest time is kept (default: 3)")
+    arg_parser.add_argument("--repl", action="store_true",
+                            help="execute the statements one line at a time as they are entered, keeping the "
+                                 "variables between the lines, until END")
+    arg_parser.add_argument("--analyze", action="store_true",
+                            help="analyze a source code being edited: read JSON requests with the source code or "
+                                 "its edited lines from the standard input, and write the syntax errors of each")
+    arg_parser.add_argument("--generate", type=int, metavar="SCALE",
+                            help="write the synthetic program of this scale used by the benchmarks to --output or "
+                                 "the standard output, and its INPUT values to --inputs if given")
+    args = arg_parser.parse_args()
+
+    if args.analyze:
+        run_analyzer(sys.stdin, sys.stdout)
+        return
+
+    if args.generate is not None:
+        source, inputs = generate_program(args.generate)
+
+        if args.output is None:
+            sys.stdout.write(source)
+        else:
+            with open(args.output, "w", encoding="utf-8") as file:
+                file.write(source)
+
+        if args.inputs is not None:
+            with open(args.inputs, "w", encoding="utf-8") as file:
+                file.write("".join(value + "\n" for value in inputs))
+        return
+
+    if args.benchmark is not None:
+        run_benchmark(args.benchmark or [1, 10, 50], engines, args.repeat, args.benchmark_results)
+        return
+
+    limits = None
+    if args.max_operations is not None or args.max_bit_length is not None or args.timeout is not None:
+        limits = ExecutionLimits(args.max_operations, args.max_bit_length, args.timeout)
+
+    if args.run_rows is not None:
+        cache = None if args.no_cache else ProgramCache(args.cache_dir)
+        run_rows(args.run_rows[0], args.run_rows[1], args.engine, cache, args.vectorize, limits)
+        return
+
+    if args.serve is not None:
+        serve(args.serve, args.workers, args.server_cache_size, limits)
+        return
+
+    if args.check is not None:
+        if not run_check(args.check, args.workers):
+            sys.exit(1)
+        return
+
+    if args.batch is not None:
+        run_batch(args.batch, args.workers, args.engine, args.cache_dir, args.no_cache, args.inputs_dir, limits)
+        return
+
+    # All the output is written through the same buffer, which is written to the output file or standard output
+    stream = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8")
+    output = OutputWriter(stream, args.flush, args.buffer_size)
+
+    try:
+        output.print(welcome_message)
+
+        # Statements are executed as they are entered, until END
+        if args.repl:
+            output.print(repl_message)
+
+            inputs = None if args.inputs is None else ListInput(read_input_values(args.inputs))
+            session = ReplSession(output, inputs, limits)
+            session.run(input)
+
+            print_symbols(output, session.interpreter)
+            output.print(termination_message, "")
+            return
+
+        # The prompt is written by input, after the output written so far
+        output.flush()
+        file_path = input("Enter INTERPOL file (.ipol): ")
+        contents = None
+
+        # Use the path relative to this script if path is not absolute
+        if not os.path.isabs(file_path):
+            file_path = pathlib.Path(str(pathlib.Path(__file__).parent.absolute()), file_path)
+
+        file_error = check_source_file(file_path)
+
+        if file_error is not None:
+            output.print(file_error)
+        else:
+            # Map the file into memory instead of reading it; the lexer scans its bytes
+            contents = read_source(file_path)
+
+        if contents is not None:
+            output.print(output_message)
+            output.print(output_message_start)
+
+            # Source code is parsed, or loaded from the cache if it did not change since it was last parsed
+            cache = None if args.no_cache else ProgramCache(args.cache_dir)
+            tokens = None
+            engine = args.engine
+            profiler = None
+
+            # A profiled program is always parsed and walked, so that the time of each line is measured
+            if args.profile or args.profile_json is not None:
+                profiler = Profiler()
+                cache = None
+                engine = "ast"
+
+            # The statements computed by the worker processes, or deferred, are those of the parsed program
+            if args.parallel or args.lazy:
+                engine = "ast"
+
+            # Tokens are only counted, or written to the tokens file instead of being kept for the table
+            if args.no_tokens:
+                tokens = TokenCounter()
+            elif args.tokens_file is not None:
+                tokens = TokenStream(open(args.tokens_file, "w", encoding="utf-8"))
+                tokens.sink.write(token_list_columns + "\n")
+
+            compiled, tokens = load_program(contents, engine, file_path, cache, tokens, profiler)
+
+            if type(tokens) is TokenStream:
+                tokens.sink.close()
+
+            # Compiled program passed to interpreter, which executes each statement
+            inputs = None if args.inputs is None else ListInput(read_input_values(args.inputs))
+            if profiler is not None:
+                interpreter = ProfilingInterpreter(compiled, profiler, output, inputs, limits)
+            elif args.parallel and limits is None:
+                interpreter = DataflowInterpreter(compiled, output, inputs, args.workers)
+            elif args.lazy and limits is None:
+                interpreter = LazyInterpreter(compiled, output, inputs, not args.no_symbols)
+            else:
+                interpreter = create_interpreter(compiled, engine, output, inputs, limits)
+            interpreter.execute()
+
+            output.print(output_message_end)
+
+            # Only the tokens read up to the error are displayed if the program raised an error
+            token_count = len(tokens) if interpreter.token_count is None else interpreter.token_count
+
+            # Display all tokens only if there are tokens available
+            if tokens.displayed and token_count > 0:
+                output.print(token_list_header)
+                output.print(token_list_columns)
+
+                for row in tokens.rows(token_count):
+                    output.print(get_token_row(*row))
+
+            if not args.no_symbols:
+                print_symbols(output, interpreter)
+
+            # Display the profile of each line, the slowest first, and the profile of the whole program
+            if args.profile:
+                output.print(profile_header)
+                output.print(profile_columns)
+
+                for profile in profiler.get_profiles() + [profiler.get_total_profile()]:
+                    output.print(get_profile_row(profile))
+
+            if args.profile_json is not None:
+                with open(args.profile_json, "w", encoding="utf-8") as file:
+                    json.dump(profiler.to_dict(compiled.code), file, indent=2)
+
+        output.print(termination_message, "")
+    finally:
+        output.flush()
+
+        if stream is not sys.stdout:
+            stream.close()
+
+
+# Displays the SYMBOLS TABLE of the variables of an interpreter, only if there are symbols available
+def print_symbols(output, interpreter):
+    symbol_list_header = "\n================= SYMBOLS TABLE =================\n"
+    symbol_list_columns = "VARIABLE NAME       TYPE        VALUE"
+
+    if len(interpreter.variables) > 0:
+        varname_ljust = 20
+
+        # Adjusts the column width depending on the largest variable name
+        if interpreter.longest_variable_length >= varname_ljust:
+            varname_ljust = varname_ljust + (interpreter.longest_variable_length - varname_ljust + 1)
+            symbol_list_columns = "VARIABLE NAME".ljust(varname_ljust) + "TYPE".ljust(12) + "VALUE"
+
+        output.print(symbol_list_header)
+        output.print(symbol_list_columns)
+
+        for name, typ, val in get_symbol_rows(interpreter):
+            # Adjusts the column width depending on the largest variable name
+            output.print(str(name).ljust(varname_ljust) + str(typ).ljust(12) + val)
 
 
 # Execute INTERPOL program automatically if running the module itself